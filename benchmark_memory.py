@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the cached calendar data of the CalDAV integration.
+
+Compares keeping a vobject tree per calendar object and a CalendarEvent
+per occurrence with the parsed components and compact occurrence records
+used by the coordinator. Run from the repository root in a Home Assistant
+development environment.
+"""
+
+import gc
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import vobject
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.util import dt as dt_util
+
+from custom_components.caldav_custom.ical import parse_components
+from custom_components.caldav_custom.recurrence import expand_vevents
+
+EVENTS = 5000
+SUMMARIES = ["Standup", "Lunch", "Gym", "1:1", "Review", "Planning"]
+
+EVENT = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//benchmark//EN
+BEGIN:VEVENT
+UID:event-{index}@benchmark
+DTSTAMP:20240101T000000Z
+DTSTART;TZID=Europe/Berlin:{start:%Y%m%dT%H%M%S}
+DTEND;TZID=Europe/Berlin:{end:%Y%m%dT%H%M%S}
+SUMMARY:{summary}
+LOCATION:Room {room}
+DESCRIPTION:Agenda for {summary} number {index}
+BEGIN:VALARM
+ACTION:DISPLAY
+DESCRIPTION:Reminder
+TRIGGER:-PT15M
+END:VALARM
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def calendar_data():
+    """Return the calendar data of the benchmark events."""
+    first = datetime(2024, 1, 1, 8)
+    return [
+        EVENT.format(
+            index=index,
+            start=first + timedelta(hours=index),
+            end=first + timedelta(hours=index, minutes=45),
+            summary=SUMMARIES[index % len(SUMMARIES)],
+            room=index % 10,
+        )
+        for index in range(EVENTS)
+    ]
+
+
+def legacy(data):
+    """Keep a vobject tree per object and a CalendarEvent per occurrence."""
+    trees = [vobject.readOne(item) for item in data]
+    events = [
+        CalendarEvent(
+            summary=tree.vevent.summary.value,
+            start=dt_util.as_local(tree.vevent.dtstart.value),
+            end=dt_util.as_local(tree.vevent.dtend.value),
+            location=tree.vevent.location.value,
+            description=tree.vevent.description.value,
+        )
+        for tree in trees
+    ]
+    return trees, events
+
+
+def compact(data):
+    """Keep the parsed components and a compact record per occurrence."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=365)
+    components = [parse_components(item, "VEVENT") for item in data]
+    occurrences = [
+        occurrence
+        for vevents in components
+        for occurrence in expand_vevents(vevents, start, end)
+    ]
+    return components, occurrences
+
+
+def measure(name, build, data):
+    """Print the memory retained by the cached data of an approach."""
+    gc.collect()
+    tracemalloc.start()
+    cached = build(data)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} {len(cached[1]):>6} events {size / 1024 / 1024:8.2f} MiB")
+    return size
+
+
+def main():
+    """Run the benchmark."""
+    data = calendar_data()
+    before = measure("legacy", legacy, data)
+    after = measure("compact", compact, data)
+    print(f"reduction {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()
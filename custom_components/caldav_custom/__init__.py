@@ -1,14 +1,14 @@
 """The caldav component."""
 
+from dataclasses import dataclass
+from functools import partial
 import logging
-
-import caldav
-from caldav.lib.error import AuthorizationError, DAVError, PropfindError
-import requests
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_PASSWORD,
+    CONF_TIMEOUT,
     CONF_URL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
@@ -16,8 +16,35 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers.storage import Store
+
+from .api import CalDavDiscoveryCache, async_validate_connection
+from .const import CONF_CONCURRENT_WRITES, CONF_POOL_SIZE, DOMAIN
+from .pool import DEFAULT_POOL_SIZE, async_get_connection_pools
+from .snapshot import CalDavSnapshots
+from .transport import (
+    DEFAULT_TIMEOUT,
+    CalDavAuthError,
+    CalDavConnectionError,
+    CalDavError,
+    CalDavTransport,
+)
+
+STORAGE_VERSION = 1
+
+
+@dataclass
+class CalDavData:
+    """Runtime data of a CalDAV config entry."""
+
+    transport: CalDavTransport
+    discovery: CalDavDiscoveryCache
+    snapshots: CalDavSnapshots
+    # Number of changes sent to the server at the same time
+    write_concurrency: int = 1
 
-type CalDavConfigEntry = ConfigEntry[caldav.DAVClient]
+
+type CalDavConfigEntry = ConfigEntry[CalDavData]
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,49 +53,113 @@ PLATFORMS: list[Platform] = [Platform.CALENDAR, Platform.TODO]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: CalDavConfigEntry) -> bool:
-    """Set up CalDAV from a config entry."""
-    client = caldav.DAVClient(
-        entry.data[CONF_URL],
-        username=entry.data[CONF_USERNAME],
-        password=entry.data[CONF_PASSWORD],
-        ssl_verify_cert=entry.data[CONF_VERIFY_SSL],
-        timeout=30,
+    """Set up CalDAV from a config entry.
+
+    The server is checked and its calendars discovered before the platforms
+    are set up only when no discovery was stored yet.
+    """
+    url = entry.data[CONF_URL]
+    verify_ssl = entry.data[CONF_VERIFY_SSL]
+    pool_size = entry.options.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE)
+    pools = async_get_connection_pools(hass)
+    session = pools.acquire(url, verify_ssl, pool_size)
+    entry.async_on_unload(partial(pools.async_release, url, verify_ssl))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    transport = CalDavTransport(
+        session,
+        url,
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+        pools.scheduler(url, verify_ssl),
     )
-    try:
-        await hass.async_add_executor_job(client.principal)
-    except PropfindError as err:
-        _LOGGER.warning("CalDAV PropfindError during setup: %s", err)
-        # PropfindError during principal() often indicates 400 Bad Request
-        # Try alternative connectivity test using calendar discovery
-        if "400" in str(err):
-            try:
-                # Alternative test: try basic HTTP connectivity to the server
-                await hass.async_add_executor_job(client.request, entry.data[CONF_URL])
-                _LOGGER.info("Setup proceeding with basic HTTP connectivity despite PropfindError")
-            except Exception as fallback_err:
-                _LOGGER.warning("Alternative setup test failed: %s", fallback_err)
-                raise ConfigEntryNotReady("CalDAV server incompatible with principal discovery") from err
-        else:
-            raise ConfigEntryNotReady("CalDAV PropfindError during setup") from err
-    except AuthorizationError as err:
-        if err.reason == "Unauthorized":
+    discovery = CalDavDiscoveryCache(
+        hass,
+        transport,
+        _discovery_store(hass, entry.entry_id),
+    )
+    # With calendars discovered before the last restart the server is only
+    # checked in the background, so a slow account does not delay startup
+    if not (discovered := await discovery.async_load()):
+        try:
+            await async_validate_connection(transport)
+            await discovery.async_refresh()
+        except CalDavAuthError as err:
             raise ConfigEntryAuthFailed("Credentials error from CalDAV server") from err
-        # AuthorizationError can be raised if the url is incorrect or
-        # on some other unexpected server response.
-        _LOGGER.warning("Unexpected CalDAV server response: %s", err)
-        return False
-    except requests.ConnectionError as err:
-        raise ConfigEntryNotReady("Connection error from CalDAV server") from err
-    except DAVError as err:
-        raise ConfigEntryNotReady("CalDAV client error") from err
+        except CalDavConnectionError as err:
+            raise ConfigEntryNotReady("Connection error from CalDAV server") from err
+        except CalDavError as err:
+            if err.status == 403:
+                # A forbidden response can be returned if the url is incorrect
+                # or on some other unexpected server response.
+                _LOGGER.warning("Unexpected CalDAV server response: %s", err)
+                return False
+            raise ConfigEntryNotReady("CalDAV client error") from err
 
-    entry.runtime_data = client
+    snapshots = CalDavSnapshots(_snapshot_store(hass, entry.entry_id))
+    await snapshots.async_load()
+    entry.runtime_data = CalDavData(
+        transport=transport,
+        discovery=discovery,
+        snapshots=snapshots,
+        # Some servers do not support concurrent modifications of a calendar
+        write_concurrency=(
+            pool_size if entry.options.get(CONF_CONCURRENT_WRITES, False) else 1
+        ),
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if discovered:
+        # The platforms add or remove entities if the calendars changed
+        entry.async_create_background_task(
+            hass,
+            _async_revalidate(hass, entry),
+            f"{DOMAIN} {entry.title} discovery",
+        )
+
     return True
 
 
+async def _async_revalidate(hass: HomeAssistant, entry: CalDavConfigEntry) -> None:
+    """Check the server and rediscover its calendars if they expired."""
+    data = entry.runtime_data
+    try:
+        await async_validate_connection(data.transport)
+        await data.discovery.async_refresh()
+    except CalDavAuthError:
+        _LOGGER.warning("Credentials error from CalDAV server %s", entry.title)
+        entry.async_start_reauth(hass)
+    except CalDavError as err:
+        _LOGGER.warning(
+            "Could not discover the calendars of %s, using the known ones: %s",
+            entry.title,
+            err,
+        )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored discovery and snapshots of a deleted config entry."""
+    await _discovery_store(hass, entry.entry_id).async_remove()
+    await _snapshot_store(hass, entry.entry_id).async_remove()
+
+
+def _discovery_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the discovered calendars of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.discovery")
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the calendar and todo snapshots of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
@@ -1,52 +1,336 @@
 """Library for working with CalDAV api."""
 
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
+from typing import Any, cast
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
 
-import caldav
-from caldav.lib.error import PropfindError
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
-from homeassistant.core import HomeAssistant
+from .const import DOMAIN
+from .ical import ICalComponent, parse_components
+from .transport import (
+    CALENDARSERVER_NS,
+    CalDavConnectionError,
+    CalDavError,
+    CalDavNotFoundError,
+    CalDavTransport,
+    Multistatus,
+    caldav_tag,
+    dav_tag,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Calendars are rarely added or removed, rediscover them once a day
+DISCOVERY_CACHE_TTL = timedelta(days=1)
+
+# Number of fallback URL patterns probed at the same time
+FALLBACK_CONCURRENCY = 3
+# hass.data key of the fallback pattern that worked for each server
+FALLBACK_PATTERNS = "fallback_patterns"
+
+GETCTAG = f"{{{CALENDARSERVER_NS}}}getctag"
+
+PROPFIND_PRINCIPAL = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:"><d:prop><d:current-user-principal/></d:prop></d:propfind>"""
+
+PROPFIND_CALENDAR_HOME = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+<d:prop><c:calendar-home-set/></d:prop></d:propfind>"""
+
+PROPFIND_COLLECTIONS = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav" \
+xmlns:cs="http://calendarserver.org/ns/">
+<d:prop><d:resourcetype/><d:displayname/><cs:getctag/>\
+<c:supported-calendar-component-set/></d:prop></d:propfind>"""
+
+PROPFIND_COLLECTION_STATE = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:" xmlns:cs="http://calendarserver.org/ns/">
+<d:prop><cs:getctag/><d:sync-token/></d:prop></d:propfind>"""
+
+REPORT_SYNC_COLLECTION = """<?xml version="1.0" encoding="utf-8"?>
+<d:sync-collection xmlns:d="DAV:"><d:sync-token>{sync_token}</d:sync-token>\
+<d:sync-level>1</d:sync-level><d:prop><d:getetag/></d:prop></d:sync-collection>"""
+
+REPORT_MULTIGET = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-multiget xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+<d:prop><d:getetag/><c:calendar-data/></d:prop>{hrefs}</c:calendar-multiget>"""
+
+REPORT_CALENDAR_QUERY = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+<d:prop><d:getetag/><c:calendar-data/></d:prop>
+<c:filter><c:comp-filter name="VCALENDAR"><c:comp-filter name="{component}">\
+{filters}</c:comp-filter></c:comp-filter></c:filter></c:calendar-query>"""
+
+REPORT_TODO_ETAGS = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+<d:prop><d:getetag/></d:prop>
+<c:filter><c:comp-filter name="VCALENDAR"><c:comp-filter name="VTODO">\
+{filters}</c:comp-filter></c:comp-filter></c:filter></c:calendar-query>"""
+
+# Todos still open by their STATUS, as not all clients set COMPLETED. The
+# prop-filters of a query must all match, and a text-match never matches a
+# missing property, so todos without a STATUS need a query of their own.
+FILTERS_OPEN = (
+    '<c:prop-filter name="STATUS"><c:is-not-defined/></c:prop-filter>',
+    '<c:prop-filter name="STATUS"><c:text-match negate-condition="yes">'
+    'COMPLETED</c:text-match></c:prop-filter>'
+    '<c:prop-filter name="STATUS"><c:text-match negate-condition="yes">'
+    "CANCELLED</c:text-match></c:prop-filter>",
+)
+
+
+@dataclass(slots=True)
+class CalDavCalendar:
+    """A calendar collection found during discovery.
+
+    The components are None when the server could not report them. The
+    CTag is read by the discovery but not stored with it.
+    """
+
+    url: str
+    name: str | None
+    id: str
+    components: list[str] | None = None
+    ctag: str | None = None
+
+    def supports(self, component: str) -> bool:
+        """Return if the calendar accepts the component type."""
+        return self.components is None or component in self.components
+
+
+class CalendarObject:
+    """A calendar object resource downloaded from the server."""
+
+    def __init__(self, href: str, etag: str | None, data: str) -> None:
+        """Initialize the object, the data is parsed on first access."""
+        self.href = href
+        self.etag = etag
+        self.data = data
+        self._components: dict[str, list[ICalComponent]] = {}
+
+    def components(self, name: str) -> list[ICalComponent]:
+        """Return the parsed components of a type, such as VEVENT."""
+        if (components := self._components.get(name)) is None:
+            components = self._components[name] = parse_components(self.data, name)
+        return components
+
+
+class CalDavDiscoveryCache:
+    """Calendar collections of an account, discovered once for all platforms.
+
+    The calendar and todo platforms both ask for the calendars supporting
+    their component, the collections and their supported components are
+    discovered once and then served from memory until the TTL expires or
+    the cache is invalidated. With a Store the discovery also survives
+    restarts, so the platforms can be set up from it while the account is
+    rediscovered in the background.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        transport: CalDavTransport,
+        store: Store[dict[str, Any]] | None = None,
+        ttl: timedelta = DISCOVERY_CACHE_TTL,
+    ) -> None:
+        """Initialize the discovery cache."""
+        self._hass = hass
+        self._transport = transport
+        self._store = store
+        self._ttl = ttl
+        self._lock = asyncio.Lock()
+        self._calendars: list[CalDavCalendar] | None = None
+        self._discovered_at: datetime | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> bool:
+        """Restore the stored discovery, return if it found any calendar."""
+        async with self._lock:
+            if self._calendars is None and self._store is not None:
+                await self._async_load()
+            return bool(self._calendars)
+
+    def calendars(self, component: str) -> list[CalDavCalendar]:
+        """Return the known calendars that support the specified component."""
+        return [
+            calendar
+            for calendar in self._calendars or []
+            if calendar.supports(component)
+        ]
+
+    async def async_refresh(self) -> None:
+        """Rediscover the calendars if they are unknown or expired."""
+        async with self._lock:
+            if self._calendars is None and self._store is not None:
+                await self._async_load()
+            if (
+                self._calendars is not None
+                and self._discovered_at is not None
+                and dt_util.utcnow() - self._discovered_at <= self._ttl
+            ):
+                return
+            calendars = await async_discover_calendars(self._hass, self._transport)
+            if not calendars and self._calendars:
+                # A server failing in some unexpected way must not remove
+                # all the entities, the empty answer has to be repeated
+                _LOGGER.warning("No calendars discovered, checking again")
+                calendars = await async_discover_calendars(
+                    self._hass, self._transport
+                )
+            self._calendars = calendars
+            # An account without calendars is rediscovered on the next
+            # refresh, and not stored to be trusted after a restart
+            self._discovered_at = dt_util.utcnow() if calendars else None
+            if calendars and self._store is not None:
+                await self._store.async_save(self._as_dict())
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for rediscovered calendars, return a function to stop."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_invalidate(self) -> None:
+        """Expire the discovered calendars so the next refresh rediscovers them.
+
+        The known calendars are still served until then.
+        """
+        async with self._lock:
+            self._discovered_at = None
+
+    async def async_rediscover(self) -> None:
+        """Rediscover the calendars now, such as after one was not found."""
+        await self.async_invalidate()
+        try:
+            await self.async_refresh()
+        except CalDavError as err:
+            _LOGGER.warning("Could not rediscover the calendars: %s", err)
+
+    async def _async_load(self) -> None:
+        """Restore the collections discovered before the last restart."""
+        if (data := await self._store.async_load()) is None:  # type: ignore[union-attr]
+            return
+        self._calendars = [
+            CalDavCalendar(
+                url=collection["url"],
+                name=collection["name"],
+                id=collection["id"],
+                components=collection["components"],
+            )
+            for collection in data["calendars"]
+        ]
+        self._discovered_at = dt_util.parse_datetime(data["discovered_at"])
+
+    def _as_dict(self) -> dict[str, Any]:
+        """Return the discovered collections in their stored form."""
+        return {
+            "discovered_at": cast(datetime, self._discovered_at).isoformat(),
+            "calendars": [
+                {
+                    "url": calendar.url,
+                    "name": calendar.name,
+                    "id": calendar.id,
+                    "components": calendar.components,
+                }
+                for calendar in self._calendars or []
+            ],
+        }
+
 
 async def async_get_calendars(
-    hass: HomeAssistant, client: caldav.DAVClient, component: str
-) -> list[caldav.Calendar]:
+    hass: HomeAssistant, transport: CalDavTransport, component: str
+) -> list[CalDavCalendar]:
     """Get all calendars that support the specified component."""
+    return [
+        calendar
+        for calendar in await async_discover_calendars(hass, transport)
+        if calendar.supports(component)
+    ]
 
-    def _get_calendars() -> list[caldav.Calendar]:
-        try:
-            # Try standard principal-based calendar discovery
-            return [
-                calendar
-                for calendar in client.principal().calendars()
-                if component in calendar.get_supported_components()
-            ]
-        except PropfindError as err:
-            _LOGGER.warning("Principal-based calendar discovery failed: %s", err)
-            if "400" in str(err):
-                # Fallback for servers like calendar.mail.ru that don't support principal discovery
-                return _get_calendars_fallback(client, component)
+
+async def async_discover_calendars(
+    hass: HomeAssistant, transport: CalDavTransport
+) -> list[CalDavCalendar]:
+    """Discover all calendars with their supported components."""
+    try:
+        # Try standard principal-based calendar discovery
+        return await _async_get_calendar_collections(
+            transport, await async_get_calendar_home(transport)
+        )
+    except CalDavError as err:
+        _LOGGER.warning("Principal-based calendar discovery failed: %s", err)
+        if isinstance(err, CalDavConnectionError) or (
+            err.status is not None and err.status != 400
+        ):
             raise
-        except Exception as err:
-            _LOGGER.warning("Calendar discovery failed: %s", err)
-            # Try fallback approach
-            return _get_calendars_fallback(client, component)
+    # Fallback for servers like calendar.mail.ru that don't support principal discovery
+    return await _async_get_calendars_fallback(hass, transport)
 
-    return await hass.async_add_executor_job(_get_calendars)
 
+async def async_validate_connection(transport: CalDavTransport) -> None:
+    """Check that the server accepts the credentials.
 
-def _get_calendars_fallback(client: caldav.DAVClient, component: str) -> list[caldav.Calendar]:
-    """Fallback calendar discovery for servers that don't support principal discovery."""
+    Some servers answer the principal PROPFIND with 400 Bad Request, they
+    are accepted as long as a plain request to the URL succeeds.
+    """
+    try:
+        await transport.propfind(transport.url, PROPFIND_PRINCIPAL)
+    except CalDavError as err:
+        if err.status != 400:
+            raise
+        _LOGGER.warning("CalDAV principal lookup failed during setup: %s", err)
+        await transport.request("OPTIONS", transport.url)
+
+
+async def async_get_calendar_home(transport: CalDavTransport) -> str:
+    """Return the calendar home URL of the current user principal."""
+    multistatus = await transport.propfind(transport.url, PROPFIND_PRINCIPAL)
+    principal = transport.url
+    for response in multistatus.responses:
+        if (prop := response.props.get(dav_tag("current-user-principal"))) is not None:
+            if (href := prop.findtext(dav_tag("href"))) is not None:
+                principal = transport.join(href.strip())
+    multistatus = await transport.propfind(principal, PROPFIND_CALENDAR_HOME)
+    for response in multistatus.responses:
+        if (prop := response.props.get(caldav_tag("calendar-home-set"))) is not None:
+            if (href := prop.findtext(dav_tag("href"))) is not None:
+                return transport.join(href.strip())
+    raise CalDavError(f"No calendar-home-set found for principal {principal}")
+
+
+async def _async_get_calendars_fallback(
+    hass: HomeAssistant, transport: CalDavTransport
+) -> list[CalDavCalendar]:
+    """Fallback calendar discovery for servers that don't support principal discovery.
+
+    The URL patterns are probed concurrently, the first one returning
+    calendars wins and the pending probes are cancelled. The winning
+    pattern is remembered per server so later setups probe it alone.
+    Raises the error of a probe when every probe failed, so an unreachable
+    server is not mistaken for an account without calendars.
+    """
     _LOGGER.info("Attempting fallback calendar discovery")
-    
-    calendars = []
-    
+
     # Try common CalDAV URL patterns
-    base_url = str(client.url).rstrip('/')
-    username = client.username
-    
+    base_url = transport.url.rstrip("/")
+    username = transport.username
+
     # Common calendar URL patterns for various servers
     patterns = [
         f"{base_url}/dav/{username}/calendar/",
@@ -57,44 +341,259 @@ def _get_calendars_fallback(client: caldav.DAVClient, component: str) -> list[ca
         f"{base_url}/remote.php/dav/calendars/{username}/",  # Nextcloud/ownCloud
         f"{base_url}/dav/calendars/{username}/",
     ]
-    
-    for pattern in patterns:
+
+    known_patterns: dict[str, str] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        FALLBACK_PATTERNS, {}
+    )
+    if (known_pattern := known_patterns.get(base_url)) in patterns:
+        _LOGGER.debug("Trying known calendar pattern: %s", known_pattern)
         try:
-            _LOGGER.debug("Trying calendar pattern: %s", pattern)
-            calendar_home = caldav.CalendarSet(client, url=pattern)
-            found_calendars = calendar_home.calendars()
-            
-            if found_calendars:
-                _LOGGER.info("Found %d calendars at %s", len(found_calendars), pattern)
-                
-                # Filter calendars by supported components
-                for calendar in found_calendars:
-                    try:
-                        supported_components = calendar.get_supported_components()
-                        if component in supported_components:
-                            calendars.append(calendar)
-                            _LOGGER.debug("Added calendar %s (supports %s)", calendar.url, component)
-                    except Exception as comp_err:
-                        # If we can't get supported components, assume it supports the component
-                        _LOGGER.debug("Could not check components for %s, assuming supported: %s", calendar.url, comp_err)
-                        calendars.append(calendar)
-                
-                break  # Stop on first successful pattern
-                
-        except Exception as pattern_err:
-            _LOGGER.debug("Pattern %s failed: %s", pattern, pattern_err)
+            if calendars := await _async_probe_calendar_pattern(
+                transport, cast(str, known_pattern)
+            ):
+                return calendars
+        except CalDavConnectionError:
+            raise
+        except CalDavError as err:
+            _LOGGER.debug("Pattern %s failed: %s", known_pattern, err)
+        del known_patterns[base_url]
+
+    semaphore = asyncio.Semaphore(FALLBACK_CONCURRENCY)
+    errors: list[CalDavError] = []
+
+    async def _probe(pattern: str) -> tuple[str, list[CalDavCalendar]]:
+        async with semaphore:
+            try:
+                return pattern, await _async_probe_calendar_pattern(
+                    transport, pattern
+                )
+            except CalDavError as err:
+                _LOGGER.debug("Pattern %s failed: %s", pattern, err)
+                errors.append(err)
+                return pattern, []
+
+    tasks = [hass.async_create_task(_probe(pattern)) for pattern in patterns]
+    try:
+        for probe in asyncio.as_completed(tasks):
+            pattern, calendars = await probe
+            if calendars:
+                known_patterns[base_url] = pattern
+                _LOGGER.info(
+                    "Fallback discovery found %d calendars at %s",
+                    len(calendars),
+                    pattern,
+                )
+                return calendars
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if len(errors) == len(patterns):
+        # Report the server being unreachable over a pattern not found
+        raise next(
+            (err for err in errors if isinstance(err, CalDavConnectionError)),
+            errors[-1],
+        )
+    _LOGGER.warning("Fallback discovery found no calendars")
+    return []
+
+
+async def _async_probe_calendar_pattern(
+    transport: CalDavTransport, pattern: str
+) -> list[CalDavCalendar]:
+    """Return the calendars found at a calendar home URL pattern."""
+    _LOGGER.debug("Trying calendar pattern: %s", pattern)
+    return await _async_get_calendar_collections(transport, pattern)
+
+
+async def _async_get_calendar_collections(
+    transport: CalDavTransport, calendar_home_url: str
+) -> list[CalDavCalendar]:
+    """Return the calendars of a calendar home with their supported components.
+
+    A single Depth:1 PROPFIND returns the resource type, display name,
+    CTag and supported components of every collection, instead of one
+    extra request per calendar.
+    """
+    multistatus = await transport.propfind(
+        calendar_home_url, PROPFIND_COLLECTIONS, depth=1
+    )
+    calendars = []
+    for response in multistatus.responses:
+        resource_type = response.props.get(dav_tag("resourcetype"))
+        if resource_type is None or resource_type.find(caldav_tag("calendar")) is None:
             continue
-    
-    if calendars:
-        _LOGGER.info("Fallback discovery found %d calendars supporting %s", len(calendars), component)
-    else:
-        _LOGGER.warning("Fallback discovery found no calendars supporting %s", component)
-    
+        components: list[str] | None = None
+        if (
+            component_set := response.props.get(
+                caldav_tag("supported-calendar-component-set")
+            )
+        ) is not None:
+            components = [
+                component.get("name", "")
+                for component in component_set.iterfind(caldav_tag("comp"))
+            ]
+        else:
+            # If we can't get supported components, assume it supports any component
+            _LOGGER.debug("No supported components reported for %s", response.href)
+        calendars.append(
+            CalDavCalendar(
+                url=response.href,
+                name=response.text(dav_tag("displayname")),
+                id=response.href.rstrip("/").split("/")[-1],
+                components=components,
+                ctag=response.text(GETCTAG),
+            )
+        )
+    _LOGGER.debug("Found %d calendars at %s", len(calendars), calendar_home_url)
     return calendars
 
 
-def get_attr_value(obj: caldav.CalendarObjectResource, attribute: str) -> str | None:
-    """Return the value of the CalDav object attribute if defined."""
-    if hasattr(obj, attribute):
-        return getattr(obj, attribute).value
-    return None
+async def async_get_collection_state(
+    transport: CalDavTransport, calendar: CalDavCalendar
+) -> tuple[str | None, str | None]:
+    """Return the CTag and RFC 6578 sync-token of a calendar collection."""
+    multistatus = await transport.propfind(calendar.url, PROPFIND_COLLECTION_STATE)
+    for response in multistatus.responses:
+        return response.text(GETCTAG), response.text(dav_tag("sync-token"))
+    return None, None
+
+
+async def async_sync_collection(
+    transport: CalDavTransport, calendar: CalDavCalendar, sync_token: str
+) -> tuple[str | None, list[CalendarObject], list[str]]:
+    """Return the new sync-token with the objects changed and deleted since sync_token.
+
+    The changed objects are downloaded with a single calendar-multiget.
+    Raises a CalDavError when the server rejects the token, in which case
+    the caller has to resynchronize the whole collection.
+    """
+    # RFC 6578 requires Depth 0, the sync level is set in the body
+    multistatus = await transport.report(
+        calendar.url,
+        REPORT_SYNC_COLLECTION.format(sync_token=escape(sync_token)),
+        depth=0,
+    )
+    deleted = []
+    changed = []
+    for response in multistatus.responses:
+        if response.status == 404:
+            deleted.append(response.href)
+        elif response.href.rstrip("/") != calendar.url.rstrip("/"):
+            changed.append(response.href)
+    return (
+        multistatus.sync_token,
+        await async_multiget(transport, calendar, changed),
+        deleted,
+    )
+
+
+async def async_multiget(
+    transport: CalDavTransport, calendar: CalDavCalendar, hrefs: list[str]
+) -> list[CalendarObject]:
+    """Download calendar objects by href with a single calendar-multiget."""
+    if not hrefs:
+        return []
+    multistatus = await transport.report(
+        calendar.url,
+        REPORT_MULTIGET.format(
+            hrefs="".join(
+                f"<d:href>{escape(urlsplit(href).path)}</d:href>" for href in hrefs
+            )
+        ),
+    )
+    return _calendar_objects(multistatus)
+
+
+async def async_search_events(
+    transport: CalDavTransport,
+    calendar: CalDavCalendar,
+    start: datetime,
+    end: datetime,
+) -> list[CalendarObject]:
+    """Return the event objects with occurrences in the time range.
+
+    Recurring events are returned unexpanded, their occurrences are
+    computed locally so servers ignoring expand requests behave the same.
+    """
+    multistatus = await transport.report(
+        calendar.url,
+        REPORT_CALENDAR_QUERY.format(
+            component="VEVENT",
+            filters=f'<c:time-range start="{_utc(start)}" end="{_utc(end)}"/>',
+        ),
+    )
+    return _calendar_objects(multistatus)
+
+
+async def async_todo_etags(
+    transport: CalDavTransport,
+    calendar: CalDavCalendar,
+    completed_since: datetime | None = None,
+) -> dict[str, str | None]:
+    """Return the href and ETag of the todos of a calendar, without their data.
+
+    With completed_since, todos completed or cancelled before it are left
+    out, by their COMPLETED time or their LAST-MODIFIED time when they have
+    none. The open and the recently closed todos are then listed by several
+    queries, as CalDAV filters cannot match either of two conditions.
+    """
+    if completed_since is None:
+        filters = [""]
+    else:
+        since = _utc(completed_since)
+        filters = [
+            *FILTERS_OPEN,
+            f'<c:prop-filter name="COMPLETED"><c:time-range start="{since}"/>'
+            "</c:prop-filter>",
+            '<c:prop-filter name="COMPLETED"><c:is-not-defined/></c:prop-filter>'
+            f'<c:prop-filter name="LAST-MODIFIED"><c:time-range start="{since}"/>'
+            "</c:prop-filter>",
+        ]
+    results = await asyncio.gather(
+        *(
+            transport.report(calendar.url, REPORT_TODO_ETAGS.format(filters=todos))
+            for todos in filters
+        )
+    )
+    return {
+        response.href: response.text(dav_tag("getetag"))
+        for multistatus in results
+        for response in multistatus.responses
+        if response.status != 404
+        and response.href.rstrip("/") != calendar.url.rstrip("/")
+    }
+
+
+async def async_todo_by_uid(
+    transport: CalDavTransport, calendar: CalDavCalendar, uid: str
+) -> CalendarObject:
+    """Return the todo with the UID, raising CalDavNotFoundError if missing."""
+    multistatus = await transport.report(
+        calendar.url,
+        REPORT_CALENDAR_QUERY.format(
+            component="VTODO",
+            filters=(
+                '<c:prop-filter name="UID"><c:text-match collation="i;octet">'
+                f"{escape(uid)}</c:text-match></c:prop-filter>"
+            ),
+        ),
+    )
+    if not (objects := _calendar_objects(multistatus)):
+        raise CalDavNotFoundError(f"No todo with UID {uid} in {calendar.url}", 404)
+    return objects[0]
+
+
+def _calendar_objects(multistatus: Multistatus) -> list[CalendarObject]:
+    """Return the calendar objects of a REPORT response."""
+    return [
+        CalendarObject(response.href, response.text(dav_tag("getetag")), data)
+        for response in multistatus.responses
+        if (data := response.text(caldav_tag("calendar-data")))
+    ]
+
+
+def _utc(value: datetime) -> str:
+    """Return a datetime in the UTC format used by CalDAV time ranges."""
+    return dt_util.as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+from typing import Any
 
-import caldav
 import voluptuous as vol
 
 from homeassistant.components.calendar import (
@@ -30,8 +30,11 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import CalDavConfigEntry
-from .api import async_get_calendars
+from .api import CalDavCalendar, async_get_calendars
+from .const import DOMAIN
 from .coordinator import CalDavUpdateCoordinator
+from .pool import async_get_connection_pools
+from .transport import CalDavTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -83,11 +86,17 @@ async def async_setup_platform(
     password = config.get(CONF_PASSWORD)
     days = config[CONF_DAYS]
 
-    client = caldav.DAVClient(
-        url, None, username, password, ssl_verify_cert=config[CONF_VERIFY_SSL]
+    # YAML calendars keep their pooled session until Home Assistant stops
+    pools = async_get_connection_pools(hass)
+    transport = CalDavTransport(
+        pools.acquire(url, config[CONF_VERIFY_SSL]),
+        url,
+        username,
+        password,
+        scheduler=pools.scheduler(url, config[CONF_VERIFY_SSL]),
     )
 
-    calendars = await async_get_calendars(hass, client, SUPPORTED_COMPONENT)
+    calendars = await async_get_calendars(hass, transport, SUPPORTED_COMPONENT)
 
     entities = []
     device_id: str | None
@@ -98,6 +107,16 @@ async def async_setup_platform(
             _LOGGER.debug("Ignoring calendar '%s'", calendar.name)
             continue
 
+        # All views of a calendar share a single coordinator so the calendar
+        # is only fetched once per cycle, whatever the number of filters
+        coordinator = CalDavUpdateCoordinator(
+            hass,
+            None,
+            transport,
+            calendar=calendar,
+            days=days,
+        )
+
         # Create additional calendars based on custom filtering rules
         for cust_calendar in config[CONF_CUSTOM_CALENDARS]:
             # Check that the base calendar matches
@@ -107,16 +126,14 @@ async def async_setup_platform(
             name = cust_calendar[CONF_NAME]
             device_id = f"{cust_calendar[CONF_CALENDAR]} {cust_calendar[CONF_NAME]}"
             entity_id = async_generate_entity_id(ENTITY_ID_FORMAT, device_id, hass=hass)
-            coordinator = CalDavUpdateCoordinator(
-                hass,
-                None,
-                calendar=calendar,
-                days=days,
-                include_all_day=True,
-                search=cust_calendar[CONF_SEARCH],
-            )
             entities.append(
-                WebDavCalendarEntity(name, entity_id, coordinator, supports_offset=True)
+                WebDavCalendarEntity(
+                    name,
+                    entity_id,
+                    coordinator,
+                    supports_offset=True,
+                    search=cust_calendar[CONF_SEARCH],
+                )
             )
 
         # Create a default calendar if there was no custom one for all calendars
@@ -125,16 +142,14 @@ async def async_setup_platform(
             name = calendar.name
             device_id = calendar.name
             entity_id = async_generate_entity_id(ENTITY_ID_FORMAT, device_id, hass=hass)
-            coordinator = CalDavUpdateCoordinator(
-                hass,
-                None,
-                calendar=calendar,
-                days=days,
-                include_all_day=False,
-                search=None,
-            )
             entities.append(
-                WebDavCalendarEntity(name, entity_id, coordinator, supports_offset=True)
+                WebDavCalendarEntity(
+                    name,
+                    entity_id,
+                    coordinator,
+                    supports_offset=True,
+                    include_all_day=False,
+                )
             )
 
     async_add_entities(entities, True)
@@ -145,28 +160,87 @@ async def async_setup_entry(
     entry: CalDavConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the CalDav calendar platform for a config entry."""
-    calendars = await async_get_calendars(hass, entry.runtime_data, SUPPORTED_COMPONENT)
-    async_add_entities(
-        (
-            WebDavCalendarEntity(
+    """Set up the CalDav calendar platform for a config entry.
+
+    Entities are added at once, with the events of their snapshot if any,
+    and refreshed in the background. When the account is rediscovered,
+    entities are added for the new calendars and removed for the deleted
+    ones.
+    """
+    discovery = entry.runtime_data.discovery
+    entities: dict[str, WebDavCalendarEntity] = {}
+
+    @callback
+    def async_add_calendars(calendars: list[CalDavCalendar]) -> None:
+        """Add the entities of calendars and refresh them."""
+        added = []
+        for calendar in calendars:
+            coordinator = CalDavUpdateCoordinator(
+                hass,
+                entry,
+                entry.runtime_data.transport,
+                calendar=calendar,
+                days=CONFIG_ENTRY_DEFAULT_DAYS,
+            )
+            coordinator.async_restore()
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{DOMAIN} {calendar.name} refresh",
+            )
+            entities[calendar.id] = entity = WebDavCalendarEntity(
                 calendar.name,
                 async_generate_entity_id(ENTITY_ID_FORMAT, calendar.name, hass=hass),
-                CalDavUpdateCoordinator(
-                    hass,
-                    entry,
-                    calendar=calendar,
-                    days=CONFIG_ENTRY_DEFAULT_DAYS,
-                    include_all_day=True,
-                    search=None,
-                ),
+                coordinator,
                 unique_id=f"{entry.entry_id}-{calendar.id}",
             )
-            for calendar in calendars
+            added.append(entity)
+        async_add_entities(added)
+
+    @callback
+    def async_update_calendars() -> None:
+        """Follow the calendars added to or deleted from the account."""
+        calendars = {
+            calendar.id: calendar
+            for calendar in discovery.calendars(SUPPORTED_COMPONENT)
             if calendar.name
-        ),
-        True,
+        }
+        for calendar_id in entities.keys() - calendars.keys():
+            entity = entities.pop(calendar_id)
+            entry.async_create_background_task(
+                hass,
+                _async_remove_entity(entity),
+                f"{DOMAIN} {entity.coordinator.calendar.name} removal",
+            )
+        async_add_calendars(
+            [
+                calendar
+                for calendar_id, calendar in calendars.items()
+                if calendar_id not in entities
+            ]
+        )
+
+    async_add_calendars(
+        [
+            calendar
+            for calendar in discovery.calendars(SUPPORTED_COMPONENT)
+            if calendar.name
+        ]
     )
+    entry.async_on_unload(discovery.async_add_listener(async_update_calendars))
+
+
+async def _async_remove_entity(entity: WebDavCalendarEntity) -> None:
+    """Remove the entity of a calendar deleted from the server.
+
+    The registry entry is kept, so the name and area set by the user are
+    restored if the calendar comes back. Its snapshot is removed once the
+    coordinator stopped, so no refresh saves it again.
+    """
+    if entity.hass is not None:
+        await entity.async_remove()
+    await entity.coordinator.async_shutdown()
+    entity.coordinator.async_remove_snapshot()
 
 
 class WebDavCalendarEntity(CoordinatorEntity[CalDavUpdateCoordinator], CalendarEntity):
@@ -179,11 +253,16 @@ class WebDavCalendarEntity(CoordinatorEntity[CalDavUpdateCoordinator], CalendarE
         coordinator: CalDavUpdateCoordinator,
         unique_id: str | None = None,
         supports_offset: bool = False,
+        search: str | None = None,
+        include_all_day: bool = True,
     ) -> None:
         """Create the WebDav Calendar Event Device."""
         super().__init__(coordinator)
         self.entity_id = entity_id
         self._event: CalendarEvent | None = None
+        self._offset: timedelta | None = None
+        self._search = search
+        self._include_all_day = include_all_day
         self._attr_name = name
         if unique_id is not None:
             self._attr_unique_id = unique_id
@@ -198,21 +277,29 @@ class WebDavCalendarEntity(CoordinatorEntity[CalDavUpdateCoordinator], CalendarE
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
         """Get all events in a specific time frame."""
-        return await self.coordinator.async_get_events(hass, start_date, end_date)
+        return await self.coordinator.async_get_events(
+            hass, start_date, end_date, self._search
+        )
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update event data."""
-        self._event = self.coordinator.data
+        (self._event, self._offset) = self.coordinator.next_event(
+            self._search, self._include_all_day
+        )
+        attributes: dict[str, Any] = {}
         if self._supports_offset:
-            self._attr_extra_state_attributes = {
-                "offset_reached": is_offset_reached(
+            attributes["offset_reached"] = (
+                is_offset_reached(
                     self._event.start_datetime_local,
-                    self.coordinator.offset,  # type: ignore[arg-type]
+                    self._offset,  # type: ignore[arg-type]
                 )
                 if self._event
                 else False
-            }
+            )
+        if self.coordinator.stale:
+            attributes["stale"] = True
+        self._attr_extra_state_attributes = attributes
         super()._handle_coordinator_update()
 
     async def async_added_to_hass(self) -> None:
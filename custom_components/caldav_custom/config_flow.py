@@ -4,16 +4,41 @@ from collections.abc import Mapping
 import logging
 from typing import Any
 
-import caldav
-from caldav.lib.error import AuthorizationError, DAVError, PropfindError
-import requests
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_PASSWORD, CONF_URL, CONF_USERNAME, CONF_VERIFY_SSL
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_TIMEOUT,
+    CONF_URL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .api import async_validate_connection
+from .const import (
+    CONF_COMPLETED_DAYS,
+    CONF_CONCURRENT_WRITES,
+    CONF_EVENT_CACHE_SIZE,
+    CONF_POOL_SIZE,
+    DOMAIN,
+)
+from .pool import DEFAULT_POOL_SIZE, async_get_connection_pools
+from .store import DEFAULT_MAX_EVENTS
+from .transport import (
+    DEFAULT_TIMEOUT,
+    CalDavAuthError,
+    CalDavConnectionError,
+    CalDavError,
+    CalDavTransport,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,6 +58,12 @@ class CalDavConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return CalDavOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -60,47 +91,32 @@ class CalDavConfigFlow(ConfigFlow, domain=DOMAIN):
 
     async def _test_connection(self, user_input: dict[str, Any]) -> str | None:
         """Test the connection to the CalDAV server and return an error if any."""
-        client = caldav.DAVClient(
-            user_input[CONF_URL],
-            username=user_input[CONF_USERNAME],
-            password=user_input[CONF_PASSWORD],
-            ssl_verify_cert=user_input[CONF_VERIFY_SSL],
+        url = user_input[CONF_URL]
+        verify_ssl = user_input[CONF_VERIFY_SSL]
+        pools = async_get_connection_pools(self.hass)
+        transport = CalDavTransport(
+            pools.acquire(url, verify_ssl),
+            url,
+            user_input[CONF_USERNAME],
+            user_input[CONF_PASSWORD],
+            scheduler=pools.scheduler(url, verify_ssl),
         )
         try:
-            # Try basic connectivity first - this might fail with PropfindError on some servers
-            await self.hass.async_add_executor_job(client.principal)
-        except PropfindError as err:
-            _LOGGER.warning("CalDAV PropfindError during principal() call: %s", err)
-            # PropfindError during principal() often indicates 400 Bad Request
-            # Try alternative connection test using calendar home set discovery
-            if "400" in str(err):
-                try:
-                    # Alternative test: try basic HTTP connectivity to the server
-                    response = await self.hass.async_add_executor_job(
-                        client.request, user_input[CONF_URL]
-                    )
-                    _LOGGER.info("Connection test passed with basic HTTP request despite PropfindError")
-                    return None
-                except Exception as fallback_err:
-                    _LOGGER.warning("Alternative connection test also failed: %s", fallback_err)
-                    return "cannot_connect"
-            return "cannot_connect"
-        except AuthorizationError as err:
+            await async_validate_connection(transport)
+        except CalDavAuthError as err:
             _LOGGER.warning("Authorization Error connecting to CalDAV server: %s", err)
-            if err.reason == "Unauthorized":
-                return "invalid_auth"
-            # AuthorizationError can be raised if the url is incorrect or
-            # on some other unexpected server response.
-            return "cannot_connect"
-        except requests.ConnectionError as err:
+            return "invalid_auth"
+        except CalDavConnectionError as err:
             _LOGGER.warning("Connection Error connecting to CalDAV server: %s", err)
             return "cannot_connect"
-        except DAVError as err:
+        except CalDavError as err:
             _LOGGER.warning("CalDAV client error: %s", err)
             return "cannot_connect"
         except Exception:
             _LOGGER.exception("Unexpected exception")
             return "unknown"
+        finally:
+            await pools.async_release(url, verify_ssl)
         return None
 
     async def async_step_reauth(
@@ -135,3 +151,43 @@ class CalDavConfigFlow(ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class CalDavOptionsFlow(OptionsFlow):
+    """Handle the connection options of a CalDAV entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_POOL_SIZE,
+                        default=options.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Optional(
+                        CONF_TIMEOUT,
+                        default=options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_CONCURRENT_WRITES,
+                        default=options.get(CONF_CONCURRENT_WRITES, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_COMPLETED_DAYS,
+                        default=options.get(CONF_COMPLETED_DAYS, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+                    vol.Optional(
+                        CONF_EVENT_CACHE_SIZE,
+                        default=options.get(CONF_EVENT_CACHE_SIZE, DEFAULT_MAX_EVENTS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=100, max=100000)),
+                }
+            ),
+        )
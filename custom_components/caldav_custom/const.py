@@ -3,3 +3,8 @@
 from typing import Final
 
 DOMAIN: Final = "caldav_custom"
+
+CONF_POOL_SIZE: Final = "pool_size"
+CONF_CONCURRENT_WRITES: Final = "concurrent_writes"
+CONF_COMPLETED_DAYS: Final = "completed_days"
+CONF_EVENT_CACHE_SIZE: Final = "event_cache_size"
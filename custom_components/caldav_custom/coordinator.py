@@ -2,20 +2,34 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, time, timedelta
-from functools import partial
+import asyncio
+from collections.abc import Iterable
+import dataclasses
+from datetime import date, datetime, timedelta
 import logging
 import re
 from typing import TYPE_CHECKING
 
-import caldav
-
 from homeassistant.components.calendar import CalendarEvent, extract_offset
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .api import get_attr_value
+from .api import (
+    CalDavCalendar,
+    CalendarObject,
+    async_get_collection_state,
+    async_search_events,
+    async_sync_collection,
+)
+from .const import CONF_EVENT_CACHE_SIZE
+from .ical import ICalComponent
+from .recurrence import Occurrence, expand_vevents
+from .scheduler import jittered
+from .store import DEFAULT_MAX_EVENTS, EventStore
+from .timer import async_get_timer_wheel
+from .transport import CalDavError, CalDavNotFoundError, CalDavTransport
 
 if TYPE_CHECKING:
     from . import CalDavConfigEntry
@@ -23,20 +37,27 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=15)
+# Bounds of the polling interval, which halves when a refresh finds
+# changes and grows by half when it does not
+MIN_UPDATE_INTERVAL = timedelta(minutes=5)
+MAX_UPDATE_INTERVAL = timedelta(hours=1)
 OFFSET = "!!"
 
 
-class CalDavUpdateCoordinator(DataUpdateCoordinator[CalendarEvent | None]):
-    """Class to utilize the calendar dav client object to get next event."""
+class CalDavUpdateCoordinator(DataUpdateCoordinator[list[Occurrence]]):
+    """Class to utilize the calendar dav client object to get upcoming events.
+
+    A single coordinator fetches a calendar once for any number of views,
+    each view only applies its own search filter to the fetched events.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: CalDavConfigEntry | None,
-        calendar: caldav.Calendar,
+        transport: CalDavTransport,
+        calendar: CalDavCalendar,
         days: int,
-        include_all_day: bool,
-        search: str | None,
     ) -> None:
         """Set up how we are going to search the WebDav calendar."""
         super().__init__(
@@ -44,203 +65,450 @@ class CalDavUpdateCoordinator(DataUpdateCoordinator[CalendarEvent | None]):
             _LOGGER,
             config_entry=entry,
             name=f"CalDAV {calendar.name}",
-            update_interval=MIN_TIME_BETWEEN_UPDATES,
+            update_interval=jittered(MIN_TIME_BETWEEN_UPDATES),
         )
+        self.transport = transport
         self.calendar = calendar
         self.days = days
-        self.include_all_day = include_all_day
-        self.search = search
-        self.offset: timedelta | None = None
+        # Objects of the current lookahead window keyed by href, kept up to
+        # date through the collection CTag and sync-token between refreshes
+        self._resources: dict[str, list[ICalComponent]] = {}
+        self._etags: dict[str, str | None] = {}
+        # Raw data of the objects the snapshot cannot save parsed
+        self._calendar_data: dict[str, str] = {}
+        self._window_start: datetime | None = None
+        self._ctag: str | None = None
+        self._sync_token: str | None = None
+        # Events of the ranges queried by the calendar panel, cleared when
+        # the CTag changes
+        self._store = EventStore(
+            entry.options.get(CONF_EVENT_CACHE_SIZE, DEFAULT_MAX_EVENTS)
+            if entry is not None
+            else DEFAULT_MAX_EVENTS
+        )
+        self._store_lock = asyncio.Lock()
+        self._timers = async_get_timer_wheel(hass)
+        # Polling interval before the jitter spreading the calendars of a server
+        self._poll_interval = MIN_TIME_BETWEEN_UPDATES
+        # Whether the data is from an earlier update as the last one failed
+        self.stale = False
+        self._snapshots = entry.runtime_data.snapshots if entry is not None else None
+        self._discovery = entry.runtime_data.discovery if entry is not None else None
+        # Window, CTag and sync-token of the last saved snapshot
+        self._snapshot_state: tuple[datetime | None, str | None, str | None] | None
+        self._snapshot_state = None
 
     async def async_get_events(
-        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+        search: str | None = None,
     ) -> list[CalendarEvent]:
-        """Get all events in a specific time frame."""
-        # Get event list from the current calendar
-        vevent_list = await hass.async_add_executor_job(
-            partial(
-                self.calendar.search,
-                start=start_date,
-                end=end_date,
-                event=True,
-                expand=True,
-            )
+        """Get all events matching the search in a specific time frame."""
+        # Only the parts of the range that were never fetched hit the server,
+        # the rest is answered from the event store
+        async with self._store_lock:
+            # A refresh clearing the store while the gaps are fetched drops
+            # them, they are then fetched again
+            while gaps := self._store.missing(start_date, end_date):
+                generation = self._store.generation
+                for gap_start, gap_end in gaps:
+                    try:
+                        vevent_list = await async_search_events(
+                            self.transport, self.calendar, gap_start, gap_end
+                        )
+                    except CalDavError as err:
+                        raise HomeAssistantError(
+                            f"CalDAV search error: {err}"
+                        ) from err
+                    self._store.add(
+                        gap_start,
+                        gap_end,
+                        self._occurrences(
+                            self._vevents(vevent_list).items(), gap_start, gap_end
+                        ),
+                        generation,
+                    )
+        return [
+            self.to_calendar_event(occurrence)
+            for occurrence in self._store.query(start_date, end_date)
+            if self.is_matching(occurrence, search)
+        ]
+
+    def next_event(
+        self, search: str | None, include_all_day: bool
+    ) -> tuple[CalendarEvent | None, timedelta | None]:
+        """Return the next event of a filtered view with its offset."""
+        occurrence = next(
+            (
+                occurrence
+                for occurrence in self.data or []
+                if (
+                    self.is_matching(occurrence, search)
+                    and (not occurrence.all_day or include_all_day)
+                    and not self.is_over(occurrence)
+                )
+            ),
+            None,
         )
-        event_list = []
-        for event in vevent_list:
-            if not hasattr(event.instance, "vevent"):
-                _LOGGER.warning("Skipped event with missing 'vevent' property")
-                continue
-            vevent = event.instance.vevent
-            if not self.is_matching(vevent, self.search):
+        if occurrence is None:
+            return None, None
+        event = self.to_calendar_event(occurrence)
+        (summary, offset) = extract_offset(event.summary, OFFSET)
+        return dataclasses.replace(event, summary=summary), offset
+
+    @staticmethod
+    def _vevents(events: Iterable[CalendarObject]) -> dict[str, list[ICalComponent]]:
+        """Return the parsed VEVENT components of the objects by href.
+
+        Only the parsed properties are kept, the raw calendar data of the
+        objects can be released. Objects without a VEVENT, such as the todos
+        of a calendar reported by a sync, are skipped.
+        """
+        vevents = {}
+        for event in events:
+            if not (components := event.components("VEVENT")):
+                _LOGGER.debug("Skipped object without VEVENT: %s", event.href)
                 continue
-            event_list.append(
-                CalendarEvent(
-                    summary=get_attr_value(vevent, "summary") or "",
-                    start=self.to_local(vevent.dtstart.value),
-                    end=self.to_local(self.get_end_date(vevent)),
-                    location=get_attr_value(vevent, "location"),
-                    description=get_attr_value(vevent, "description"),
-                )
-            )
+            vevents[event.href] = components
+        return vevents
 
-        return event_list
+    def _keep_calendar_data(self, objects: Iterable[CalendarObject]) -> None:
+        """Keep the raw data of the window objects the snapshot cannot save parsed.
 
-    async def _async_update_data(self) -> CalendarEvent | None:
+        Their timezones are only defined in the calendar data, they are
+        saved as such and parsed again when restored.
+        """
+        for resource in objects:
+            components = self._resources.get(resource.href, [])
+            if not all(component.serializable for component in components):
+                self._calendar_data[resource.href] = resource.data
+            else:
+                self._calendar_data.pop(resource.href, None)
+
+    @staticmethod
+    def _occurrences(
+        resources: Iterable[tuple[str, list[ICalComponent]]],
+        start: datetime,
+        end: datetime,
+    ) -> list[tuple[str, Occurrence]]:
+        """Return the (href, occurrence) pairs of the events in the range."""
+        return [
+            (href, occurrence)
+            for href, vevents in resources
+            for occurrence in expand_vevents(vevents, start, end)
+        ]
+
+    async def _async_update_data(self) -> list[Occurrence]:
         """Get the latest data."""
         start_of_today = dt_util.start_of_local_day()
         start_of_tomorrow = dt_util.start_of_local_day() + timedelta(days=self.days)
 
-        # We have to retrieve the results for the whole day as the server
-        # won't return events that have already started
-        results = await self.hass.async_add_executor_job(
-            partial(
-                self.calendar.search,
-                start=start_of_today,
-                end=start_of_tomorrow,
-                event=True,
-                expand=True,
-            ),
+        try:
+            changed = await self._async_sync_window(start_of_today, start_of_tomorrow)
+        except CalDavError as err:
+            if isinstance(err, CalDavNotFoundError) and self._discovery is not None:
+                # The calendar was probably deleted, its entity is removed
+                # once the account is rediscovered without it
+                self.hass.async_create_task(self._discovery.async_rediscover())
+            if self.data is None:
+                raise UpdateFailed(f"CalDAV update error: {err}") from err
+            # Keep the entities available with the events of the last update
+            if not self.stale:
+                _LOGGER.warning(
+                    "Serving cached events of %s: %s", self.calendar.name, err
+                )
+            self.stale = True
+            self.update_interval = jittered(MIN_UPDATE_INTERVAL)
+            return self.data
+        if self.stale:
+            _LOGGER.info("Events of %s are up to date again", self.calendar.name)
+            self.stale = False
+        self._adapt_update_interval(changed)
+        if changed or self._snapshot_state != self._state():
+            self._save_snapshot()
+        return self._window_occurrences(start_of_today)
+
+    def _window_occurrences(self, start_of_today: datetime) -> list[Occurrence]:
+        """Return the sorted occurrences of the lookahead window.
+
+        State updates are scheduled at their boundaries.
+        """
+        occurrences = [
+            occurrence
+            for _, occurrence in self._occurrences(
+                self._resources.items(),
+                start_of_today,
+                start_of_today + timedelta(days=self.days),
+            )
+        ]
+        occurrences.sort(key=lambda x: x.start)
+        _LOGGER.debug(
+            "Found %d events in the lookahead window of %s",
+            len(occurrences),
+            self.calendar.name,
         )
+        self._schedule_boundaries(occurrences, start_of_today + timedelta(days=1))
+        return occurrences
 
-        # Create new events for each recurrence of an event that happens today.
-        # For recurring events, some servers return the original event with recurrence rules
-        # and they would not be properly parsed using their original start/end dates.
-        new_events = []
-        for event in results:
-            if not hasattr(event.instance, "vevent"):
-                _LOGGER.warning("Skipped event with missing 'vevent' property")
-                continue
-            vevent = event.instance.vevent
-            for start_dt in vevent.getrruleset() or []:
-                _start_of_today: date | datetime
-                _start_of_tomorrow: datetime | date
-                if self.is_all_day(vevent):
-                    start_dt = start_dt.date()
-                    _start_of_today = start_of_today.date()
-                    _start_of_tomorrow = start_of_tomorrow.date()
+    def _state(self) -> tuple[datetime | None, str | None, str | None]:
+        """Return the window, CTag and sync-token the objects are current for."""
+        return (self._window_start, self._ctag, self._sync_token)
+
+    def _save_snapshot(self) -> None:
+        """Save the objects of the window to restore them after a restart."""
+        if self._snapshots is None:
+            return
+        self._snapshots.async_set(
+            f"calendar.{self.calendar.id}",
+            {
+                "window_start": (
+                    self._window_start.isoformat() if self._window_start else None
+                ),
+                "ctag": self._ctag,
+                "sync_token": self._sync_token,
+                "objects": {
+                    href: [
+                        self._etags.get(href),
+                        (
+                            self._calendar_data[href]
+                            if href in self._calendar_data
+                            else [component.as_dict() for component in components]
+                        ),
+                    ]
+                    for href, components in self._resources.items()
+                },
+            },
+        )
+        self._snapshot_state = self._state()
+
+    @callback
+    def async_remove_snapshot(self) -> None:
+        """Remove the snapshot of a calendar deleted from the server."""
+        if self._snapshots is not None:
+            self._snapshots.async_remove(f"calendar.{self.calendar.id}")
+
+    @callback
+    def async_restore(self) -> bool:
+        """Restore the objects saved before the last restart.
+
+        The events of the window are available at once, the next refresh
+        revalidates them with the restored CTag and sync-token. Returns
+        whether a snapshot was restored.
+        """
+        if self._snapshots is None or (
+            snapshot := self._snapshots.get(f"calendar.{self.calendar.id}")
+        ) is None:
+            return False
+        resources: dict[str, list[ICalComponent]] = {}
+        calendar_data: dict[str, str] = {}
+        try:
+            for href, (etag, saved) in snapshot["objects"].items():
+                if isinstance(saved, str):
+                    calendar_data[href] = saved
+                    resources[href] = CalendarObject(href, etag, saved).components(
+                        "VEVENT"
+                    )
                 else:
-                    _start_of_today = start_of_today
-                    _start_of_tomorrow = start_of_tomorrow
-                if _start_of_today <= start_dt < _start_of_tomorrow:
-                    new_event = event.copy()
-                    new_vevent = new_event.instance.vevent  # type: ignore[attr-defined]
-                    if hasattr(new_vevent, "dtend"):
-                        dur = new_vevent.dtend.value - new_vevent.dtstart.value
-                        new_vevent.dtend.value = start_dt + dur
-                    new_vevent.dtstart.value = start_dt
-                    new_events.append(new_event)
-                elif _start_of_tomorrow <= start_dt:
-                    break
-        vevents = [
-            event.instance.vevent
-            for event in results + new_events
-            if hasattr(event.instance, "vevent")
-        ]
+                    resources[href] = [
+                        ICalComponent.from_dict(component) for component in saved
+                    ]
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring snapshot of %s: %s", self.calendar.name, err)
+            return False
+        self._resources = resources
+        self._calendar_data = calendar_data
+        self._etags = {href: etag for href, (etag, _) in snapshot["objects"].items()}
+        if (window_start := snapshot["window_start"]) is not None:
+            self._window_start = dt_util.parse_datetime(window_start)
+        self._ctag = snapshot["ctag"]
+        self._sync_token = snapshot["sync_token"]
+        self._snapshot_state = self._state()
+        self.data = self._window_occurrences(dt_util.start_of_local_day())
+        return True
 
-        # dtstart can be a date or datetime depending if the event lasts a
-        # whole day. Convert everything to datetime to be able to sort it
-        vevents.sort(key=lambda x: self.to_datetime(x.dtstart.value))
+    def _adapt_update_interval(self, changed: bool) -> None:
+        """Poll calendars that change often more frequently than idle ones."""
+        interval = self._poll_interval
+        if changed:
+            interval = max(MIN_UPDATE_INTERVAL, interval / 2)
+        else:
+            interval = min(MAX_UPDATE_INTERVAL, interval * 1.5)
+        if interval != self._poll_interval:
+            _LOGGER.debug("Polling %s every %s", self.calendar.name, interval)
+        self._poll_interval = interval
+        self.update_interval = jittered(interval)
 
-        vevent = next(
-            (
-                vevent
-                for vevent in vevents
-                if (
-                    self.is_matching(vevent, self.search)
-                    and (not self.is_all_day(vevent) or self.include_all_day)
-                    and not self.is_over(vevent)
+    def _schedule_boundaries(
+        self, occurrences: list[Occurrence], window_rollover: datetime
+    ) -> None:
+        """Schedule state updates at the event starts, ends and offsets.
+
+        Entities are updated from the cached events without contacting
+        the server. The lookahead window moving at midnight triggers a
+        refresh instead.
+        """
+        self._timers.async_cancel(self)
+        now = dt_util.utcnow().timestamp()
+        rollover = window_rollover.timestamp()
+        self._timers.async_schedule(self, rollover, self._async_handle_rollover)
+        for occurrence in occurrences:
+            if occurrence.start >= rollover:
+                break
+            boundaries = [occurrence.start, occurrence.end]
+            if OFFSET in occurrence.summary:
+                (_, offset) = extract_offset(occurrence.summary, OFFSET)
+                boundaries.append(occurrence.start + int(offset.total_seconds()))
+            for boundary in boundaries:
+                if now < boundary < rollover:
+                    self._timers.async_schedule(
+                        self, boundary, self.async_update_listeners
+                    )
+
+    @callback
+    def _async_handle_rollover(self) -> None:
+        """Refresh the calendar when the lookahead window moves."""
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled state updates when the coordinator stops."""
+        await super().async_shutdown()
+        self._timers.async_remove(self)
+
+    async def _async_sync_window(self, start: datetime, end: datetime) -> bool:
+        """Bring the cached objects of the lookahead window up to date.
+
+        An unchanged CTag means nothing has to be downloaded, a known
+        sync-token lets the server report only the changed and deleted
+        objects. A new window, or a server rejecting the sync-token,
+        falls back to searching the whole window again. Returns whether
+        the calendar changed since the previous refresh.
+        """
+        if self._window_start is None and self.calendar.ctag is not None:
+            # The first refresh follows the discovery, which read the CTag
+            # already. The sync-token is read by a later refresh.
+            ctag, sync_token = self.calendar.ctag, None
+        else:
+            try:
+                ctag, sync_token = await async_get_collection_state(
+                    self.transport, self.calendar
                 )
-            ),
-            None,
-        )
+            except CalDavError as err:
+                _LOGGER.debug(
+                    "Could not read collection state of %s: %s",
+                    self.calendar.name,
+                    err,
+                )
+                ctag = sync_token = None
 
-        # If no matching event could be found
-        if vevent is None:
-            _LOGGER.debug(
-                "No matching event found in the %d results for %s",
-                len(vevents),
-                self.calendar.name,
-            )
-            self.offset = None
-            return None
+        if start == self._window_start:
+            if ctag is not None and ctag == self._ctag:
+                _LOGGER.debug(
+                    "CTag unchanged for %s, skipping fetch", self.calendar.name
+                )
+                # The objects are unchanged, the token read with the CTag
+                # describes them. Without it the sync-token stays unknown
+                # after a first refresh using the CTag of the discovery.
+                if sync_token is not None:
+                    self._sync_token = sync_token
+                return False
+            if self._sync_token is not None:
+                try:
+                    (
+                        new_sync_token,
+                        changed,
+                        deleted,
+                    ) = await async_sync_collection(
+                        self.transport, self.calendar, self._sync_token
+                    )
+                except CalDavError as err:
+                    _LOGGER.debug(
+                        "Sync-token rejected for %s, resyncing: %s",
+                        self.calendar.name,
+                        err,
+                    )
+                else:
+                    # A sync reports the changes of the whole collection,
+                    # todos are skipped and only the events occurring in the
+                    # window are kept
+                    vevents = self._vevents(changed)
+                    window_changed = False
+                    for href in [*deleted, *(event.href for event in changed)]:
+                        window_changed |= self._resources.pop(href, None) is not None
+                        self._etags.pop(href, None)
+                        self._calendar_data.pop(href, None)
+                    for href in deleted:
+                        self._store.remove(href)
+                    if vevents:
+                        # Changed events may have occurrences anywhere in the
+                        # stored ranges, so they are fetched again on demand
+                        self._store.clear()
+                    for href, components in vevents.items():
+                        if expand_vevents(components, start, end):
+                            self._resources[href] = components
+                            window_changed = True
+                    self._keep_calendar_data(changed)
+                    self._etags.update(
+                        (event.href, event.etag)
+                        for event in changed
+                        if event.href in self._resources
+                    )
+                    self._ctag = ctag
+                    self._sync_token = new_sync_token
+                    return window_changed
 
-        # Populate the entity attributes with the event values
-        (summary, offset) = extract_offset(
-            get_attr_value(vevent, "summary") or "", OFFSET
-        )
-        self.offset = offset
-        return CalendarEvent(
-            summary=summary,
-            start=self.to_local(vevent.dtstart.value),
-            end=self.to_local(self.get_end_date(vevent)),
-            location=get_attr_value(vevent, "location"),
-            description=get_attr_value(vevent, "description"),
+        # We have to retrieve the results for the whole day as the server
+        # won't return events that have already started
+        results = await async_search_events(self.transport, self.calendar, start, end)
+        etags = {event.href: event.etag for event in results}
+        if ctag is not None and self._ctag is not None:
+            changed = ctag != self._ctag
+        else:
+            changed = start == self._window_start and etags != self._etags
+        self._resources = self._vevents(results)
+        self._calendar_data = {}
+        self._keep_calendar_data(results)
+        self._etags = etags
+        if ctag is None or ctag != self._ctag:
+            self._store.clear()
+        self._store.add(
+            start, end, self._occurrences(self._resources.items(), start, end)
         )
+        self._window_start = start
+        self._ctag = ctag
+        self._sync_token = sync_token
+        return changed
 
     @staticmethod
-    def is_matching(vevent, search):
+    def is_matching(event: Occurrence, search: str | None) -> bool:
         """Return if the event matches the filter criteria."""
         if search is None:
             return True
 
         pattern = re.compile(search)
-        return (
-            (hasattr(vevent, "summary") and pattern.match(vevent.summary.value))
-            or (hasattr(vevent, "location") and pattern.match(vevent.location.value))
-            or (
-                hasattr(vevent, "description")
-                and pattern.match(vevent.description.value)
-            )
+        return any(
+            value and pattern.match(value)
+            for value in (event.summary, event.location, event.description)
         )
 
     @staticmethod
-    def is_all_day(vevent):
-        """Return if the event last the whole day."""
-        return not isinstance(vevent.dtstart.value, datetime)
-
-    @staticmethod
-    def is_over(vevent):
+    def is_over(event: Occurrence) -> bool:
         """Return if the event is over."""
-        return dt_util.now() >= CalDavUpdateCoordinator.to_datetime(
-            CalDavUpdateCoordinator.get_end_date(vevent)
-        )
+        return dt_util.utcnow().timestamp() >= event.end
 
     @staticmethod
-    def to_datetime(obj):
-        """Return a datetime."""
-        if isinstance(obj, datetime):
-            return CalDavUpdateCoordinator.to_local(obj)
-        return datetime.combine(obj, time.min).replace(
-            tzinfo=dt_util.get_default_time_zone()
+    def to_calendar_event(occurrence: Occurrence) -> CalendarEvent:
+        """Return the CalendarEvent for an occurrence."""
+        start: date | datetime = occurrence.start_datetime_local
+        end: date | datetime = occurrence.end_datetime_local
+        if occurrence.all_day:
+            start = start.date()
+            end = end.date()
+        return CalendarEvent(
+            summary=occurrence.summary,
+            start=start,
+            end=end,
+            location=occurrence.location,
+            description=occurrence.description,
         )
-
-    @staticmethod
-    def to_local(obj: datetime | date) -> datetime | date:
-        """Return a datetime as a local datetime, leaving dates unchanged.
-
-        This handles giving floating times a timezone for comparison
-        with all day events and dropping the custom timezone object
-        used by the caldav client and dateutil so the datetime can be copied.
-        """
-        if isinstance(obj, datetime):
-            return dt_util.as_local(obj)
-        return obj
-
-    @staticmethod
-    def get_end_date(obj):
-        """Return the end datetime as determined by dtend or duration."""
-        if hasattr(obj, "dtend"):
-            enddate = obj.dtend.value
-        elif hasattr(obj, "duration"):
-            enddate = obj.dtstart.value + obj.duration.value
-        else:
-            enddate = obj.dtstart.value + timedelta(days=1)
-
-        # End date for an all day event is exclusive. This fixes the case where
-        # an all day event has a start and end values are the same, or the event
-        # has a zero duration.
-        if not isinstance(enddate, datetime) and obj.dtstart.value == enddate:
-            enddate += timedelta(days=1)
-
-        return enddate
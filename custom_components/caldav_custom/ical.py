@@ -0,0 +1,387 @@
+"""Selective iCalendar parser for the read path."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone, tzinfo
+import logging
+import re
+import sys
+from typing import Any
+
+import vobject
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Properties read from events and todos, all others are skipped unparsed
+_DATE_PROPERTIES = frozenset({"DTSTART", "DTEND", "DUE", "RECURRENCE-ID"})
+_DATE_LIST_PROPERTIES = frozenset({"RDATE", "EXDATE"})
+_TEXT_PROPERTIES = frozenset({"SUMMARY", "LOCATION", "DESCRIPTION"})
+_RAW_PROPERTIES = frozenset({"UID", "STATUS", "RRULE", "DURATION"})
+_PROPERTIES = (
+    _DATE_PROPERTIES | _DATE_LIST_PROPERTIES | _TEXT_PROPERTIES | _RAW_PROPERTIES
+)
+
+_DURATION = re.compile(
+    r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+_TEXT_ESCAPES = re.compile(r"\\(.)")
+
+
+class UnsupportedCalendarDataError(ValueError):
+    """The data needs the full parser, e.g. for a TZID only defined inline."""
+
+
+class ICalComponent:
+    """The properties of an event or todo used by the integration."""
+
+    __slots__ = (
+        "description",
+        "dtend",
+        "dtstart",
+        "due",
+        "duration",
+        "exdates",
+        "location",
+        "name",
+        "rdates",
+        "recurrence_id",
+        "rrules",
+        "status",
+        "summary",
+        "uid",
+    )
+
+    def __init__(self, name: str) -> None:
+        """Initialize a component without properties."""
+        self.name = name
+        self.uid: str | None = None
+        self.summary: str | None = None
+        self.location: str | None = None
+        self.description: str | None = None
+        self.status: str | None = None
+        self.dtstart: date | datetime | None = None
+        self.dtend: date | datetime | None = None
+        self.due: date | datetime | None = None
+        self.duration: timedelta | None = None
+        self.recurrence_id: date | datetime | None = None
+        self.rrules: list[str] = []
+        self.rdates: list[date | datetime] = []
+        self.exdates: list[date | datetime] = []
+
+    @classmethod
+    def from_vobject(cls, component: Any) -> ICalComponent:
+        """Return the properties of a component parsed by vobject."""
+        parsed = cls(component.name.upper())
+        for attribute in ("uid", "summary", "location", "description", "status"):
+            if hasattr(component, attribute):
+                setattr(parsed, attribute, getattr(component, attribute).value)
+        for attribute in ("dtstart", "dtend", "due", "duration", "recurrence_id"):
+            if hasattr(component, attribute):
+                setattr(parsed, attribute, getattr(component, attribute).value)
+        contents = component.contents
+        parsed.rrules = [line.value for line in contents.get("rrule", [])]
+        parsed.rdates = [
+            value[0] if isinstance(value, tuple) else value
+            for line in contents.get("rdate", [])
+            for value in line.value
+        ]
+        parsed.exdates = [
+            value for line in contents.get("exdate", []) for value in line.value
+        ]
+        return parsed
+
+    @property
+    def serializable(self) -> bool:
+        """Return if as_dict can encode the component.
+
+        Timezones only defined in the calendar data, such as the Windows
+        names of Exchange, cannot be encoded.
+        """
+        return all(
+            _is_encodable(value)
+            for value in (
+                self.dtstart,
+                self.dtend,
+                self.due,
+                self.recurrence_id,
+                *self.rdates,
+                *self.exdates,
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the properties in a JSON serializable form, without the unset.
+
+        Raises UnsupportedCalendarDataError when the component is not
+        serializable.
+        """
+        data: dict[str, Any] = {"name": self.name}
+        for attribute in ("uid", "summary", "location", "description", "status"):
+            if (value := getattr(self, attribute)) is not None:
+                data[attribute] = value
+        for attribute in ("dtstart", "dtend", "due", "recurrence_id"):
+            if (value := getattr(self, attribute)) is not None:
+                data[attribute] = _encode_date(value)
+        if self.duration is not None:
+            data["duration"] = self.duration.total_seconds()
+        if self.rrules:
+            data["rrules"] = self.rrules
+        if self.rdates:
+            data["rdates"] = [_encode_date(value) for value in self.rdates]
+        if self.exdates:
+            data["exdates"] = [_encode_date(value) for value in self.exdates]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ICalComponent:
+        """Return a component from the form returned by as_dict.
+
+        Raises ValueError when a timezone is not known anymore.
+        """
+        component = cls(data["name"])
+        for attribute in ("uid", "summary", "location", "description", "status"):
+            setattr(component, attribute, data.get(attribute))
+        for attribute in ("dtstart", "dtend", "due", "recurrence_id"):
+            if (value := data.get(attribute)) is not None:
+                setattr(component, attribute, _decode_date(value))
+        if (duration := data.get("duration")) is not None:
+            component.duration = timedelta(seconds=duration)
+        component.rrules = data.get("rrules", [])
+        component.rdates = [_decode_date(value) for value in data.get("rdates", [])]
+        component.exdates = [_decode_date(value) for value in data.get("exdates", [])]
+        return component
+
+
+def parse_components(data: str, name: str) -> list[ICalComponent]:
+    """Return the components of a type in an iCalendar object.
+
+    Only the properties used by the integration are decoded, everything
+    else, including nested components such as alarms, is skipped. Data
+    the selective parser cannot handle is parsed in full by vobject.
+    """
+    try:
+        return _parse_selective(data, name)
+    except ValueError as err:
+        _LOGGER.debug("Parsing calendar object with vobject: %s", err)
+    instance = vobject.readOne(data)
+    return [
+        ICalComponent.from_vobject(component)
+        for component in instance.contents.get(name.lower(), [])
+    ]
+
+
+def _parse_selective(data: str, name: str) -> list[ICalComponent]:
+    """Parse the components of a type, raising on unsupported data."""
+    components = []
+    current: ICalComponent | None = None
+    # Depth of components nested inside the current one, which are skipped
+    nested = 0
+    for line in _unfolded_lines(data):
+        prop_name, params, rest = _split_line(line)
+        if prop_name == "BEGIN":
+            if current is not None:
+                nested += 1
+            elif rest.upper() == name:
+                current = ICalComponent(name)
+            continue
+        if prop_name == "END":
+            if nested:
+                nested -= 1
+            elif current is not None and rest.upper() == name:
+                components.append(current)
+                current = None
+            continue
+        if current is None or nested or prop_name not in _PROPERTIES:
+            continue
+        _set_property(current, prop_name, _parameters(params), rest)
+    return components
+
+
+def _unfolded_lines(data: str) -> Iterator[str]:
+    """Yield the component delimiters and the lines of the used properties.
+
+    Lines of other properties are dropped as soon as their name is read,
+    their continuation lines, such as inline attachments, are never joined.
+    """
+    pending: list[str] = []
+    for line in data.split("\n"):
+        line = line.removesuffix("\r")
+        if line[:1] in (" ", "\t"):
+            if pending:
+                pending.append(line[1:])
+            continue
+        if pending:
+            yield "".join(pending)
+            pending = []
+        name = _property_name(line)
+        if name in _PROPERTIES:
+            pending = [line]
+        elif name in ("BEGIN", "END"):
+            yield line
+    if pending:
+        yield "".join(pending)
+
+
+def _property_name(line: str) -> str:
+    """Return the name of the property of a content line."""
+    end = len(line)
+    for separator in (";", ":"):
+        if (index := line.find(separator, 0, end)) != -1:
+            end = index
+    return line[:end].upper()
+
+
+def _split_line(line: str) -> tuple[str, str, str]:
+    """Return the name, parameters and value of a content line."""
+    prop, _, value = line.partition(":")
+    if '"' in prop:
+        # Quoted parameter values may contain colons
+        quoted = False
+        for index, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ":" and not quoted:
+                prop, value = line[:index], line[index + 1 :]
+                break
+    name, _, params = prop.partition(";")
+    return name.upper(), params, value
+
+
+def _parameters(params: str) -> dict[str, str]:
+    """Return the parameters of a property, quotes removed."""
+    if not params:
+        return {}
+    result = {}
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        result[key.upper()] = value.strip('"')
+    return result
+
+
+def _set_property(
+    component: ICalComponent, name: str, params: dict[str, str], value: str
+) -> None:
+    """Decode a property value into the component."""
+    if name in _TEXT_PROPERTIES:
+        text = _TEXT_ESCAPES.sub(_unescape, value)
+        if name != "DESCRIPTION":
+            # Summaries and locations repeat across events and calendars
+            text = sys.intern(text)
+        setattr(component, name.lower(), text)
+    elif name == "UID":
+        component.uid = value
+    elif name == "STATUS":
+        component.status = value.upper()
+    elif name == "RRULE":
+        component.rrules.append(value)
+    elif name == "DURATION":
+        component.duration = parse_duration(value)
+    elif name in _DATE_PROPERTIES:
+        setattr(
+            component,
+            name.lower().replace("-", "_"),
+            _parse_date(value, params),
+        )
+    else:
+        values = [
+            _parse_date(item.partition("/")[0], params)
+            for item in value.split(",")
+            if item
+        ]
+        if name == "RDATE":
+            component.rdates.extend(values)
+        else:
+            component.exdates.extend(values)
+
+
+def _unescape(match: re.Match[str]) -> str:
+    """Return the character of a TEXT escape sequence."""
+    char = match.group(1)
+    return "\n" if char in "nN" else char
+
+
+def _parse_date(value: str, params: dict[str, str]) -> date | datetime:
+    """Return a DATE or DATE-TIME value."""
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    if len(value) < 15 or value[8] != "T":
+        raise ValueError(f"Invalid DATE-TIME value {value}")
+    tz: tzinfo | None = None
+    if value.endswith("Z"):
+        tz = dt_util.UTC
+    elif (tzid := params.get("TZID")) is not None:
+        tz = _time_zone(tzid)
+    return datetime(
+        int(value[:4]),
+        int(value[4:6]),
+        int(value[6:8]),
+        int(value[9:11]),
+        int(value[11:13]),
+        int(value[13:15]),
+        tzinfo=tz,
+    )
+
+
+def _time_zone(tzid: str) -> tzinfo:
+    """Return the timezone of a TZID naming an IANA timezone."""
+    if (tz := dt_util.get_time_zone(tzid.removeprefix("/"))) is None:
+        raise UnsupportedCalendarDataError(f"Unknown TZID {tzid}")
+    return tz
+
+
+def parse_duration(value: str) -> timedelta:
+    """Return a DURATION value."""
+    if (match := _DURATION.match(value.strip())) is None:
+        raise ValueError(f"Invalid DURATION value {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+    )
+    return -duration if sign == "-" else duration
+
+
+def _encode_date(value: date | datetime) -> str | list[str]:
+    """Return a date or datetime as an ISO string, with the timezone name.
+
+    Raises UnsupportedCalendarDataError for a timezone only defined in the
+    calendar data, which has no name to restore it by.
+    """
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        return value.isoformat()
+    if isinstance(value.tzinfo, timezone):
+        # A fixed offset has no daylight saving time, UTC is equivalent
+        return [value.astimezone(dt_util.UTC).replace(tzinfo=None).isoformat(), "UTC"]
+    if (key := _time_zone_key(value.tzinfo)) is None:
+        raise UnsupportedCalendarDataError(f"Timezone {value.tzinfo} has no name")
+    return [value.replace(tzinfo=None).isoformat(), key]
+
+
+def _is_encodable(value: date | datetime | None) -> bool:
+    """Return if _encode_date can encode a value."""
+    return (
+        not isinstance(value, datetime)
+        or value.tzinfo is None
+        or isinstance(value.tzinfo, timezone)
+        or _time_zone_key(value.tzinfo) is not None
+    )
+
+
+def _time_zone_key(tz: tzinfo) -> str | None:
+    """Return the IANA name of a zoneinfo or pytz timezone."""
+    return getattr(tz, "key", None) or getattr(tz, "zone", None)
+
+
+def _decode_date(value: str | list[str]) -> date | datetime:
+    """Return a date or datetime encoded by _encode_date."""
+    if isinstance(value, list):
+        return datetime.fromisoformat(value[0]).replace(tzinfo=_time_zone(value[1]))
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value)
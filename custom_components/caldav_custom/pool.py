@@ -0,0 +1,129 @@
+"""Shared keep-alive connection pools for CalDAV servers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util.ssl import get_default_context, get_default_no_verify_context
+
+from .const import DOMAIN
+from .scheduler import RequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+# Seconds an idle connection is kept open for the next request
+KEEPALIVE_TIMEOUT = 60
+# hass.data key of the pool registry
+CONNECTION_POOLS = "connection_pools"
+
+
+@dataclass
+class _Pool:
+    """A client session, its request queue and the number of clients using it."""
+
+    session: aiohttp.ClientSession
+    scheduler: RequestScheduler
+    users: int = 0
+
+
+class CalDavConnectionPools:
+    """Registry of client sessions shared per (host, verify_ssl).
+
+    Every config entry, YAML calendar and config flow talking to the same
+    server goes through one keep-alive connector, so several accounts on a
+    host reuse their TLS connections instead of each opening their own.
+    Their requests are queued by one scheduler, which limits them to the
+    connections of the pool and backs off when the server throttles.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._pools: dict[tuple[str, bool], _Pool] = {}
+
+    @staticmethod
+    def key(url: str, verify_ssl: bool) -> tuple[str, bool]:
+        """Return the registry key of a server URL."""
+        split = urlsplit(url)
+        return (f"{split.scheme}://{split.netloc}".lower(), verify_ssl)
+
+    def acquire(
+        self, url: str, verify_ssl: bool, pool_size: int = DEFAULT_POOL_SIZE
+    ) -> aiohttp.ClientSession:
+        """Return the session of a server, creating its pool if needed.
+
+        The pool size is fixed when the pool is created, later clients of
+        the same server share the existing connections.
+        """
+        key = self.key(url, verify_ssl)
+        if (pool := self._pools.get(key)) is None or pool.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=pool_size,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ssl=(
+                    get_default_context()
+                    if verify_ssl
+                    else get_default_no_verify_context()
+                ),
+            )
+            pool = self._pools[key] = _Pool(
+                aiohttp.ClientSession(
+                    connector=connector,
+                    headers={"User-Agent": SERVER_SOFTWARE},
+                ),
+                RequestScheduler(pool_size),
+            )
+            _LOGGER.debug("Opened connection pool of %d for %s", pool_size, key[0])
+        elif pool.session.connector is not None and (
+            pool.session.connector.limit_per_host != pool_size
+        ):
+            _LOGGER.debug(
+                "Connection pool for %s already open with %d connections",
+                key[0],
+                pool.session.connector.limit_per_host,
+            )
+        pool.users += 1
+        return pool.session
+
+    def scheduler(self, url: str, verify_ssl: bool) -> RequestScheduler:
+        """Return the request scheduler of a server whose session is acquired."""
+        return self._pools[self.key(url, verify_ssl)].scheduler
+
+    async def async_release(self, url: str, verify_ssl: bool) -> None:
+        """Release a session, closing it once no client uses it anymore."""
+        key = self.key(url, verify_ssl)
+        if (pool := self._pools.get(key)) is None:
+            return
+        pool.users -= 1
+        if pool.users <= 0:
+            del self._pools[key]
+            await pool.session.close()
+            _LOGGER.debug("Closed connection pool for %s", key[0])
+
+    async def async_close(self) -> None:
+        """Close all sessions."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.session.close()
+
+
+@callback
+def async_get_connection_pools(hass: HomeAssistant) -> CalDavConnectionPools:
+    """Return the connection pool registry, closed when Home Assistant stops."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (pools := data.get(CONNECTION_POOLS)) is None:
+        pools = data[CONNECTION_POOLS] = CalDavConnectionPools()
+
+        async def _async_close(_event: Event) -> None:
+            await pools.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return pools
@@ -0,0 +1,288 @@
+"""Bounded expansion of recurring calendar components."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any, cast
+
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rruleset, rrulestr
+
+from homeassistant.util import dt as dt_util
+
+from .ical import ICalComponent
+
+# Length of one period of each frequency a rule can be shifted by
+_PERIODS: dict[str, relativedelta | timedelta] = {
+    "YEARLY": relativedelta(years=1),
+    "MONTHLY": relativedelta(months=1),
+    "WEEKLY": timedelta(weeks=1),
+    "DAILY": timedelta(days=1),
+    "HOURLY": timedelta(hours=1),
+    "MINUTELY": timedelta(minutes=1),
+    "SECONDLY": timedelta(seconds=1),
+}
+# Rule parts that replace the day of DTSTART as the day of the occurrences
+_DAY_PARTS = ("BYWEEKNO", "BYYEARDAY", "BYMONTHDAY", "BYDAY", "BYEASTER")
+
+
+class Occurrence:
+    """Compact record of a single occurrence of an event.
+
+    Start and end are epoch seconds, the local midnights of the first and
+    the day after the last day for all day events. The text fields are the
+    strings of the parsed component, shared by all the occurrences of a
+    series. A CalendarEvent is only built from a record when an entity
+    exposes it.
+    """
+
+    __slots__ = ("all_day", "description", "end", "location", "start", "summary")
+
+    def __init__(
+        self,
+        component: ICalComponent,
+        start: date | datetime,
+        end: date | datetime,
+    ) -> None:
+        """Initialize the record of a component occurring from start to end."""
+        self.all_day = not isinstance(start, datetime)
+        self.start = int(_local(start).timestamp())
+        self.end = int(_local(end).timestamp())
+        self.summary = component.summary or ""
+        self.location = component.location
+        self.description = component.description
+
+    @property
+    def start_datetime_local(self) -> datetime:
+        """Return the start as a local datetime."""
+        return datetime.fromtimestamp(self.start, dt_util.get_default_time_zone())
+
+    @property
+    def end_datetime_local(self) -> datetime:
+        """Return the end as a local datetime."""
+        return datetime.fromtimestamp(self.end, dt_util.get_default_time_zone())
+
+
+def recurrence_starts(
+    dtstart: date | datetime,
+    duration: timedelta,
+    rrules: Iterable[str],
+    rdates: Iterable[date | datetime],
+    exdates: Iterable[date | datetime],
+    start: datetime,
+    end: datetime,
+) -> list[date | datetime]:
+    """Return the starts of the occurrences overlapping the range, sorted.
+
+    Rules are evaluated from the last whole period before the range
+    instead of from DTSTART, so the cost depends on the number of
+    occurrences in the range rather than on the age of the series. Rules
+    limited by COUNT are the exception as their occurrences have to be
+    counted from the first one.
+    """
+    all_day = not isinstance(dtstart, datetime)
+    first = (
+        _wall_clock(dtstart)
+        if isinstance(dtstart, datetime)
+        else datetime.combine(dtstart, time.min)
+    )
+    tz = first.tzinfo
+    range_start = _normalize(start, tz)
+    range_end = _normalize(end, tz)
+    # Occurrences starting up to a duration before the range still overlap it
+    lookback = range_start - duration
+
+    occurrences = rruleset()
+    for rule in rrules:
+        occurrences.rrule(_bounded_rule(rule, first, lookback))
+    # DTSTART is always the first instance, even when it does not match the rule
+    occurrences.rdate(first)
+    for rdate in rdates:
+        occurrences.rdate(_normalize(rdate, tz))
+    for exdate in exdates:
+        occurrences.exdate(_normalize(exdate, tz))
+
+    return [
+        occurrence.date() if all_day else occurrence
+        for occurrence in occurrences.between(lookback, range_end, inc=True)
+        if occurrence < range_end
+        and (occurrence + duration > range_start or occurrence >= range_start)
+    ]
+
+
+def expand_vevents(
+    vevents: list[ICalComponent], start: datetime, end: datetime
+) -> list[Occurrence]:
+    """Return the occurrences of the events of a calendar object in the range.
+
+    Components with a RECURRENCE-ID override the occurrence of the series
+    they refer to. A calendar object made only of such components, as an
+    expanded report returns them, is treated as a list of single events.
+    """
+    masters = []
+    overrides: dict[Any, ICalComponent] = {}
+    for vevent in vevents:
+        if vevent.dtstart is None:
+            continue
+        if vevent.recurrence_id is not None:
+            overrides[_instance_key(vevent.recurrence_id)] = vevent
+        else:
+            masters.append(vevent)
+    if not masters:
+        masters = list(overrides.values())
+        overrides = {}
+
+    occurrences = []
+    for master in masters:
+        dtstart = cast(date | datetime, master.dtstart)
+        dtend = component_end(master)
+        if not master.rrules and not master.rdates:
+            if _overlaps(dtstart, dtend, start, end):
+                occurrences.append(Occurrence(master, dtstart, dtend))
+            continue
+        duration = dtend - dtstart
+        for occurrence in recurrence_starts(
+            dtstart,
+            duration,
+            master.rrules,
+            master.rdates,
+            master.exdates,
+            start,
+            end,
+        ):
+            if _instance_key(occurrence) in overrides:
+                continue
+            occurrences.append(Occurrence(master, occurrence, occurrence + duration))
+
+    for override in overrides.values():
+        dtstart = cast(date | datetime, override.dtstart)
+        dtend = component_end(override)
+        if _overlaps(dtstart, dtend, start, end):
+            occurrences.append(Occurrence(override, dtstart, dtend))
+    return occurrences
+
+
+def component_end(component: ICalComponent) -> date | datetime:
+    """Return the end of a component as determined by dtend or duration."""
+    dtstart = cast(date | datetime, component.dtstart)
+    if component.dtend is not None:
+        enddate = component.dtend
+    elif component.duration is not None:
+        enddate = dtstart + component.duration
+    else:
+        enddate = dtstart + timedelta(days=1)
+
+    # End date for an all day event is exclusive. This fixes the case where
+    # an all day event has a start and end values are the same, or the event
+    # has a zero duration.
+    if not isinstance(enddate, datetime) and dtstart == enddate:
+        enddate += timedelta(days=1)
+
+    return enddate
+
+
+def _bounded_rule(rule: str, dtstart: datetime, lookback: datetime) -> Any:
+    """Return a dateutil rule starting as close as possible before lookback."""
+    parts = dict(
+        part.split("=", 1) for part in rule.upper().split(";") if "=" in part
+    )
+    until = parts.pop("UNTIL", None)
+    freq = parts.get("FREQ", "")
+    # dateutil derives the missing day of a monthly or yearly rule from
+    # DTSTART, which must not change when the start is shifted
+    if not any(part in parts for part in _DAY_PARTS):
+        if freq == "YEARLY":
+            parts.setdefault("BYMONTH", str(dtstart.month))
+            parts["BYMONTHDAY"] = str(dtstart.day)
+        elif freq == "MONTHLY":
+            parts["BYMONTHDAY"] = str(dtstart.day)
+
+    rule_start = dtstart
+    if "COUNT" not in parts and freq in _PERIODS and lookback > dtstart:
+        interval = int(parts.get("INTERVAL", 1))
+        elapsed = _elapsed_periods(freq, dtstart, lookback)
+        # Keep one interval of margin so the shifted period is never one
+        # that the original rule would have cut short at DTSTART
+        if (periods := (elapsed // interval - 1) * interval) > 0:
+            rule_start = dtstart + _PERIODS[freq] * periods
+
+    bounded = rrulestr(
+        ";".join(f"{key}={value}" for key, value in parts.items()),
+        dtstart=rule_start,
+    )
+    if until is not None:
+        bounded = bounded.replace(until=_parse_until(until, dtstart.tzinfo))
+    return bounded
+
+
+def _elapsed_periods(freq: str, dtstart: datetime, value: datetime) -> int:
+    """Return the number of whole periods between DTSTART and a later value."""
+    if freq == "YEARLY":
+        return value.year - dtstart.year
+    if freq == "MONTHLY":
+        return (value.year - dtstart.year) * 12 + value.month - dtstart.month
+    return int((value - dtstart) / _PERIODS[freq])
+
+
+def _parse_until(value: str, tz: tzinfo | None) -> datetime:
+    """Return the UNTIL of a rule comparable with its DTSTART."""
+    if len(value) == 8:
+        # A date includes the whole day
+        until = datetime.combine(datetime.strptime(value, "%Y%m%d"), time.max)
+        return until.replace(tzinfo=tz)
+    until = datetime.strptime(value.removesuffix("Z"), "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        until = until.replace(tzinfo=dt_util.UTC)
+    return _normalize(until, tz)
+
+
+def _wall_clock(value: datetime) -> datetime:
+    """Return a datetime whose timezone follows DST in date arithmetic.
+
+    vobject returns pytz timezones for well known TZIDs, which keep the
+    offset of DTSTART for every occurrence.
+    """
+    if (zone := getattr(value.tzinfo, "zone", None)) is None:
+        return value
+    if (tz := dt_util.get_time_zone(zone)) is None:
+        return value
+    return value.astimezone(tz)
+
+
+def _normalize(value: date | datetime, tz: tzinfo | None) -> datetime:
+    """Return a date or datetime as a datetime of the same kind as DTSTART.
+
+    All day and floating events are evaluated in naive local time, the
+    others in the timezone of their DTSTART.
+    """
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min, tz)
+    if value.tzinfo is None:
+        return value if tz is None else value.replace(tzinfo=tz)
+    if tz is None:
+        return dt_util.as_local(value).replace(tzinfo=None)
+    return value
+
+
+def _local(value: date | datetime) -> datetime:
+    """Return a date or datetime as a local datetime."""
+    if isinstance(value, datetime):
+        return dt_util.as_local(value)
+    return datetime.combine(value, time.min, dt_util.get_default_time_zone())
+
+
+def _instance_key(value: date | datetime) -> Any:
+    """Return a key identifying an occurrence by its original start."""
+    if isinstance(value, datetime):
+        return value.timestamp() if value.tzinfo is not None else value
+    return datetime.combine(value, time.min)
+
+
+def _overlaps(
+    dtstart: date | datetime, dtend: date | datetime, start: datetime, end: datetime
+) -> bool:
+    """Return if a single event overlaps the range."""
+    event_start = _normalize(dtstart, start.tzinfo)
+    event_end = _normalize(dtend, start.tzinfo)
+    return event_start < end and (event_end > start or event_start >= start)
@@ -0,0 +1,136 @@
+"""Per-server scheduling of CalDAV requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import logging
+import random
+import time
+
+from .transport import (
+    CalDavCircuitOpenError,
+    CalDavConnectionError,
+    CalDavError,
+    CalDavThrottledError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delay before retrying a server that throttled without a Retry-After
+DEFAULT_RETRY_AFTER = 60
+# Longest a server is left alone, whatever Retry-After it sent
+MAX_RETRY_AFTER = 3600
+# Longest a request waits for a throttled server before failing instead
+MAX_THROTTLE_WAIT = 30
+# Consecutive failed requests after which the requests fail at once
+FAILURE_THRESHOLD = 3
+# Seconds before the first trial request, doubled after each failed one
+BASE_BACKOFF = 30
+MAX_BACKOFF = 1800
+# Relative random variation of the refresh intervals
+JITTER = 0.1
+
+
+class RequestScheduler:
+    """Queue of the requests sent to one server.
+
+    At most max_in_flight requests are sent at the same time. When the
+    server throttles with a 429 or 503, the queued requests wait until its
+    Retry-After has passed, or fail when that is too far away, so the
+    calendars and to-do lists of an account back off together.
+
+    Requests also go through a circuit breaker. After repeated connection
+    or server errors they fail at once instead of waiting for their
+    timeout, until a single trial request is let through after a backoff
+    doubling with each failed trial.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        """Initialize an idle scheduler."""
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        # Monotonic time before which no request is sent
+        self._resume_at = 0.0
+        # Consecutive failed requests, the circuit is open from the threshold
+        self._failures = 0
+        self._backoff = 0.0
+        self._open_until = 0.0
+        self._probing = False
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for the server to accept another request."""
+        probe = False
+        if self._failures >= FAILURE_THRESHOLD:
+            if self._probing or time.monotonic() < self._open_until:
+                raise CalDavCircuitOpenError(
+                    f"Server unavailable after {self._failures} failed requests"
+                )
+            probe = self._probing = True
+        try:
+            async with self._semaphore:
+                while (delay := self._resume_at - time.monotonic()) > 0:
+                    if delay > MAX_THROTTLE_WAIT:
+                        raise CalDavThrottledError(
+                            f"Server throttled, retrying in {delay:.0f}s"
+                        )
+                    await asyncio.sleep(delay)
+                try:
+                    yield
+                except CalDavThrottledError as err:
+                    self._throttle(err.retry_after)
+                    raise
+                except CalDavError as err:
+                    if isinstance(err, CalDavConnectionError) or (
+                        err.status is not None and err.status >= 500
+                    ):
+                        self._record_failure(probe)
+                    else:
+                        # The server answered, the request itself was wrong
+                        self._record_success()
+                    raise
+                self._record_success()
+        finally:
+            if probe:
+                self._probing = False
+
+    def _throttle(self, retry_after: float | None) -> None:
+        """Hold the requests to the server for the delay it asked for."""
+        delay = (
+            DEFAULT_RETRY_AFTER
+            if retry_after is None
+            else min(retry_after, MAX_RETRY_AFTER)
+        )
+        _LOGGER.debug("Server throttled, holding requests for %.0fs", delay)
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def _record_failure(self, probe: bool) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures != FAILURE_THRESHOLD and not probe:
+            return
+        self._backoff = min(MAX_BACKOFF, self._backoff * 2 or BASE_BACKOFF)
+        self._open_until = time.monotonic() + self._backoff
+        _LOGGER.warning(
+            "Server failed %d requests, retrying in %.0fs",
+            self._failures,
+            self._backoff,
+        )
+
+    def _record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self._failures >= FAILURE_THRESHOLD:
+            _LOGGER.info("Server available again")
+        self._failures = 0
+        self._backoff = 0.0
+
+
+def jittered(interval: timedelta) -> timedelta:
+    """Return a refresh interval varied at random.
+
+    Calendars and to-do lists set up together at startup would otherwise
+    poll their server in synchronized bursts.
+    """
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
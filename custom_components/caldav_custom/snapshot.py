@@ -0,0 +1,46 @@
+"""Snapshots of the calendars and to-do lists of an entry kept across restarts."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+# Seconds the snapshot is kept in memory before being written, so the
+# refreshes of all the calendars of an entry are saved together
+SAVE_DELAY = 30
+
+
+class CalDavSnapshots:
+    """Last known state of the calendars and to-do lists of a config entry.
+
+    Each coordinator and to-do list stores a compact snapshot under its own
+    key after a successful refresh, and restores it at startup so entities
+    have a state before the server answers.
+    """
+
+    def __init__(self, store: Store[dict[str, Any]]) -> None:
+        """Initialize empty snapshots."""
+        self._store = store
+        self._snapshots: dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshots saved before the last restart."""
+        self._snapshots = await self._store.async_load() or {}
+
+    def get(self, key: str) -> Any | None:
+        """Return a snapshot, if one was saved."""
+        return self._snapshots.get(key)
+
+    @callback
+    def async_set(self, key: str, snapshot: Any) -> None:
+        """Replace a snapshot and schedule the snapshots to be saved."""
+        self._snapshots[key] = snapshot
+        self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Remove a snapshot and schedule the snapshots to be saved."""
+        if self._snapshots.pop(key, None) is not None:
+            self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY)
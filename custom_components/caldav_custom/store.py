@@ -0,0 +1,193 @@
+"""In-memory event store for caldav."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from datetime import datetime
+
+from .recurrence import Occurrence
+
+# Occurrences kept per calendar before the least recently used ranges are
+# evicted, a few hundred bytes each
+DEFAULT_MAX_EVENTS = 10000
+
+
+class EventStore:
+    """Time indexed event occurrences of a single calendar.
+
+    Occurrences are kept in an array sorted by start time, so a range query is
+    a bisection followed by a scan over the events starting inside the
+    range (plus the ones that may still be running, bounded by the
+    longest known event duration). The store also records which time
+    ranges have been fetched from the server so only the uncovered parts
+    of a query need a round trip.
+
+    Once the store holds more than max_events occurrences, the fetched
+    ranges that were least recently queried are evicted along with the
+    occurrences no other range covers.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS) -> None:
+        """Initialize an empty store."""
+        self._max_events = max_events
+        # Events keyed by the href of their calendar object, then by start
+        self._events: dict[str, dict[int, Occurrence]] = {}
+        self._size = 0
+        self._index: list[Occurrence] = []
+        self._starts: list[int] = []
+        self._max_duration = 0
+        self._dirty = False
+        # Sorted, non overlapping (start, end) ranges fetched from the server
+        self._covered: list[tuple[float, float]] = []
+        # Query count when each fetched range was last used, the merged
+        # ranges above are their union
+        self._fetched: dict[tuple[float, float], int] = {}
+        self._queries = 0
+        # Changed whenever events are dropped, a range fetched meanwhile
+        # may hold the dropped events
+        self.generation = 0
+
+    def clear(self) -> None:
+        """Forget all events and fetched ranges."""
+        self.generation += 1
+        self._events.clear()
+        self._size = 0
+        self._covered.clear()
+        self._fetched.clear()
+        self._dirty = True
+
+    def remove(self, href: str) -> None:
+        """Remove all occurrences of a deleted calendar object."""
+        self.generation += 1
+        if (occurrences := self._events.pop(href, None)) is not None:
+            self._size -= len(occurrences)
+            self._dirty = True
+
+    def missing(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the parts of the range that have not been fetched yet.
+
+        Starts a new query, the fetched ranges it overlaps become the most
+        recently used.
+        """
+        self._queries += 1
+        range_start = start.timestamp()
+        range_end = end.timestamp()
+        for fetched in self._fetched:
+            if fetched[0] < range_end and fetched[1] > range_start:
+                self._fetched[fetched] = self._queries
+        tz = start.tzinfo
+        gaps = []
+        cursor = start.timestamp()
+        range_end = end.timestamp()
+        for covered_start, covered_end in self._covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= range_end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < range_end:
+            gaps.append((cursor, range_end))
+        return [
+            (datetime.fromtimestamp(gap_start, tz), datetime.fromtimestamp(gap_end, tz))
+            for gap_start, gap_end in gaps
+        ]
+
+    def add(
+        self,
+        start: datetime,
+        end: datetime,
+        events: Iterable[tuple[str, Occurrence]],
+        generation: int | None = None,
+    ) -> None:
+        """Store the (href, event) pairs fetched for a range and mark it covered.
+
+        Events fetched at an earlier generation than the current one are
+        dropped, the range is fetched again by the next query.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        for href, event in events:
+            occurrences = self._events.setdefault(href, {})
+            if event.start not in occurrences:
+                self._size += 1
+            occurrences[event.start] = event
+        self._dirty = True
+        self._fetched[(start.timestamp(), end.timestamp())] = self._queries
+        self._cover(start.timestamp(), end.timestamp())
+        if self._size > self._max_events:
+            self._evict()
+
+    def query(self, start: datetime, end: datetime) -> list[Occurrence]:
+        """Return the stored events overlapping the range, sorted by start."""
+        if self._dirty:
+            self._rebuild()
+        range_start = start.timestamp()
+        range_end = end.timestamp()
+        low = bisect_left(self._starts, range_start - self._max_duration)
+        high = bisect_left(self._starts, range_end, low)
+        return [event for event in self._index[low:high] if event.end > range_start]
+
+    def _cover(self, start: float, end: float) -> None:
+        """Add a fetched range, merging it with overlapping or adjacent ones."""
+        insort(self._covered, (start, end))
+        merged: list[tuple[float, float]] = []
+        for covered_start, covered_end in self._covered:
+            if merged and covered_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+            else:
+                merged.append((covered_start, covered_end))
+        self._covered = merged
+
+    def _evict(self) -> None:
+        """Evict the least recently used ranges until the store fits.
+
+        The ranges used by the current query are kept even when they alone
+        exceed the limit.
+        """
+        evicted = False
+        for fetched, used in sorted(self._fetched.items(), key=lambda item: item[1]):
+            if self._size <= self._max_events or used == self._queries:
+                break
+            del self._fetched[fetched]
+            evicted = True
+            self._covered = []
+            for covered in sorted(self._fetched):
+                self._cover(*covered)
+            self._drop_uncovered()
+        if evicted:
+            self._dirty = True
+
+    def _drop_uncovered(self) -> None:
+        """Remove the occurrences that no fetched range overlaps anymore."""
+        covered_starts = [covered_start for covered_start, _ in self._covered]
+        for href, occurrences in list(self._events.items()):
+            for occurrence_start, occurrence in list(occurrences.items()):
+                # Only the last range starting before the occurrence ends can
+                # overlap it, the ranges being merged
+                position = bisect_left(covered_starts, occurrence.end) - 1
+                if position < 0 or self._covered[position][1] <= occurrence.start:
+                    del occurrences[occurrence_start]
+                    self._size -= 1
+            if not occurrences:
+                del self._events[href]
+
+    def _rebuild(self) -> None:
+        """Rebuild the sorted index after events were added or removed."""
+        self._index = sorted(
+            (
+                event
+                for occurrences in self._events.values()
+                for event in occurrences.values()
+            ),
+            key=lambda event: event.start,
+        )
+        self._starts = [event.start for event in self._index]
+        self._max_duration = max(
+            (event.end - event.start for event in self._index), default=0
+        )
+        self._dirty = False
@@ -0,0 +1,117 @@
+"""Shared timer wheel for calendar state transitions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from datetime import datetime
+import heapq
+import math
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+# hass.data key of the timer wheel
+TIMER_WHEEL = "timer_wheel"
+
+
+class TimerWheel:
+    """A single timer driving the event boundaries of all calendars.
+
+    Deadlines are bucketed by second. Adding a deadline to an existing
+    bucket and cancelling all the deadlines of an owner are O(1), only a
+    new bucket pushes its second on a heap. Firing a bucket runs each
+    distinct action once. Only one Home Assistant timer is armed, for the
+    earliest bucket.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty wheel."""
+        self._hass = hass
+        self._buckets: dict[int, list[tuple[Hashable, int, Callable[[], None]]]] = {}
+        self._seconds: list[int] = []
+        # Deadlines scheduled under an older generation of their owner are
+        # cancelled and skipped when their bucket fires
+        self._generations: dict[Hashable, int] = {}
+        self._armed: int | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule(
+        self, owner: Hashable, when: float, action: Callable[[], None]
+    ) -> None:
+        """Run an action at a timestamp, unless the owner cancels it first."""
+        second = math.ceil(when)
+        generation = self._generations.setdefault(owner, 0)
+        if (bucket := self._buckets.get(second)) is None:
+            bucket = self._buckets[second] = []
+            heapq.heappush(self._seconds, second)
+        bucket.append((owner, generation, action))
+        self._arm()
+
+    @callback
+    def async_cancel(self, owner: Hashable) -> None:
+        """Cancel all the pending actions of an owner."""
+        if owner in self._generations:
+            self._generations[owner] += 1
+
+    @callback
+    def async_remove(self, owner: Hashable) -> None:
+        """Cancel the actions of an owner that will not schedule again."""
+        self._generations.pop(owner, None)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the wheel, dropping all pending actions."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed = None
+        self._buckets.clear()
+        self._seconds.clear()
+
+    def _arm(self) -> None:
+        """Arm the timer for the earliest bucket."""
+        if not self._seconds or self._seconds[0] == self._armed:
+            return
+        if self._unsub is not None:
+            self._unsub()
+        self._armed = self._seconds[0]
+        self._unsub = async_track_point_in_utc_time(
+            self._hass, self._async_fire, dt_util.utc_from_timestamp(self._armed)
+        )
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Run the actions of all the buckets that are due."""
+        self._unsub = None
+        self._armed = None
+        now = dt_util.utcnow().timestamp()
+        due = []
+        while self._seconds and self._seconds[0] <= now:
+            due.extend(self._buckets.pop(heapq.heappop(self._seconds)))
+        seen: set[Callable[[], None]] = set()
+        for owner, generation, action in due:
+            if self._generations.get(owner) != generation or action in seen:
+                continue
+            seen.add(action)
+            action()
+        self._arm()
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the timer wheel, stopped when Home Assistant stops."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (wheel := data.get(TIMER_WHEEL)) is None:
+        wheel = data[TIMER_WHEEL] = TimerWheel(hass)
+
+        @callback
+        def _async_stop(_event: Event) -> None:
+            wheel.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_stop)
+    return wheel
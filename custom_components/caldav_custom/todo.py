@@ -7,10 +7,11 @@ from datetime import date, datetime, timedelta
 from functools import partial
 import logging
 from typing import Any, cast
+from urllib.parse import urljoin
+import uuid
 
-import caldav
-from caldav.lib.error import DAVError, NotFoundError
-import requests
+import icalendar
+import voluptuous as vol
 
 from homeassistant.components.todo import (
     TodoItem,
@@ -18,13 +19,37 @@ from homeassistant.components.todo import (
     TodoListEntity,
     TodoListEntityFeature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
 from . import CalDavConfigEntry
-from .api import async_get_calendars, get_attr_value
+from .api import (
+    CalDavCalendar,
+    CalDavDiscoveryCache,
+    CalendarObject,
+    async_multiget,
+    async_todo_by_uid,
+    async_todo_etags,
+)
+from .const import CONF_COMPLETED_DAYS, DOMAIN
+from .scheduler import jittered
+from .snapshot import CalDavSnapshots
+from .timer import async_get_timer_wheel
+from .transport import (
+    CalDavError,
+    CalDavNotFoundError,
+    CalDavPreconditionFailedError,
+    CalDavTransport,
+    HttpResponse,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,37 +67,127 @@ TODO_STATUS_MAP_INV: dict[TodoItemStatus, str] = {
     TodoItemStatus.COMPLETED: "COMPLETED",
 }
 
+SERVICE_ADD_ITEMS = "add_items"
+ATTR_ITEMS = "items"
+ATTR_ITEM = "item"
+ATTR_DUE_DATE = "due_date"
+ATTR_DUE_DATETIME = "due_datetime"
+ATTR_DESCRIPTION = "description"
+ATTR_UID = "uid"
+ATTR_ERROR = "error"
+
+ADD_ITEMS_SCHEMA = {
+    vol.Required(ATTR_ITEMS): vol.All(
+        cv.ensure_list,
+        [
+            vol.All(
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ITEM): vol.All(cv.string, vol.Length(min=1)),
+                        vol.Optional(ATTR_DUE_DATE): cv.date,
+                        vol.Optional(ATTR_DUE_DATETIME): vol.All(
+                            cv.datetime, dt_util.as_local
+                        ),
+                        vol.Optional(ATTR_DESCRIPTION): cv.string,
+                    }
+                ),
+                cv.has_at_most_one_key(ATTR_DUE_DATE, ATTR_DUE_DATETIME),
+            )
+        ],
+    )
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: CalDavConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the CalDav todo platform for a config entry."""
-    calendars = await async_get_calendars(hass, entry.runtime_data, SUPPORTED_COMPONENT)
-    async_add_entities(
-        (
+    """Set up the CalDav todo platform for a config entry.
+
+    Lists are added for the known calendars, then added and removed as the
+    account is rediscovered.
+    """
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_ADD_ITEMS,
+        ADD_ITEMS_SCHEMA,
+        "async_add_todo_items",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    discovery = entry.runtime_data.discovery
+    entities: dict[str, WebDavTodoListEntity] = {}
+
+    @callback
+    def async_add_calendars(calendars: list[CalDavCalendar]) -> None:
+        """Add the lists of calendars."""
+        added = [
             WebDavTodoListEntity(
+                entry.runtime_data.transport,
                 calendar,
                 entry.entry_id,
+                entry.runtime_data.write_concurrency,
+                entry.options.get(CONF_COMPLETED_DAYS, 0),
+                entry.runtime_data.snapshots,
+                discovery,
             )
             for calendar in calendars
-        ),
-        True,
-    )
+        ]
+        entities.update(zip((calendar.id for calendar in calendars), added))
+        # Lists are added at once, with the items of their snapshot if any,
+        # and updated once added
+        for entity in added:
+            entity.restore()
+        async_add_entities(added)
+
+    @callback
+    def async_update_calendars() -> None:
+        """Follow the lists added to or deleted from the account."""
+        calendars = {
+            calendar.id: calendar
+            for calendar in discovery.calendars(SUPPORTED_COMPONENT)
+        }
+        for calendar_id in entities.keys() - calendars.keys():
+            entity = entities.pop(calendar_id)
+            entry.async_create_background_task(
+                hass,
+                _async_remove_entity(entity),
+                f"{DOMAIN} {entity.entity_id} removal",
+            )
+        async_add_calendars(
+            [
+                calendar
+                for calendar_id, calendar in calendars.items()
+                if calendar_id not in entities
+            ]
+        )
+
+    async_add_calendars(discovery.calendars(SUPPORTED_COMPONENT))
+    entry.async_on_unload(discovery.async_add_listener(async_update_calendars))
+
 
+async def _async_remove_entity(entity: WebDavTodoListEntity) -> None:
+    """Remove the entity of a list deleted from the server.
 
-def _todo_item(resource: caldav.CalendarObjectResource) -> TodoItem | None:
+    The registry entry is kept, so the name and area set by the user are
+    restored if the list comes back. Its snapshot is removed once the
+    entity stopped polling, so no update saves it again.
+    """
+    if entity.hass is not None:
+        await entity.async_remove()
+    entity.async_remove_snapshot()
+
+
+def _todo_item(resource: CalendarObject) -> TodoItem | None:
     """Convert a caldav Todo into a TodoItem."""
     if (
-        not hasattr(resource.instance, "vtodo")
-        or not (todo := resource.instance.vtodo)
-        or (uid := get_attr_value(todo, "uid")) is None
-        or (summary := get_attr_value(todo, "summary")) is None
+        not (todos := resource.components("VTODO"))
+        or (uid := (todo := todos[0]).uid) is None
+        or (summary := todo.summary) is None
     ):
         return None
     due: date | datetime | None = None
-    if due_value := get_attr_value(todo, "due"):
+    if due_value := todo.due:
         if isinstance(due_value, datetime):
             due = dt_util.as_local(due_value)
         elif isinstance(due_value, date):
@@ -81,11 +196,11 @@ def _todo_item(resource: caldav.CalendarObjectResource) -> TodoItem | None:
         uid=uid,
         summary=summary,
         status=TODO_STATUS_MAP.get(
-            get_attr_value(todo, "status") or "",
+            todo.status or "",
             TodoItemStatus.NEEDS_ACTION,
         ),
         due=due,
-        description=get_attr_value(todo, "description"),
+        description=todo.description,
     )
 
 
@@ -93,6 +208,8 @@ class WebDavTodoListEntity(TodoListEntity):
     """CalDAV To-do list entity."""
 
     _attr_has_entity_name = True
+    # Polled on the shared timer wheel at a jittered interval instead
+    _attr_should_poll = False
     _attr_supported_features = (
         TodoListEntityFeature.CREATE_TODO_ITEM
         | TodoListEntityFeature.UPDATE_TODO_ITEM
@@ -102,102 +219,411 @@ class WebDavTodoListEntity(TodoListEntity):
         | TodoListEntityFeature.SET_DESCRIPTION_ON_ITEM
     )
 
-    def __init__(self, calendar: caldav.Calendar, config_entry_id: str) -> None:
+    def __init__(
+        self,
+        transport: CalDavTransport,
+        calendar: CalDavCalendar,
+        config_entry_id: str,
+        write_concurrency: int = 1,
+        completed_days: int = 0,
+        snapshots: CalDavSnapshots | None = None,
+        discovery: CalDavDiscoveryCache | None = None,
+    ) -> None:
         """Initialize WebDavTodoListEntity."""
+        self._transport = transport
+        self._write_concurrency = write_concurrency
+        # Completed todos older than this are not retrieved, all when None
+        self._completed_window = (
+            timedelta(days=completed_days) if completed_days else None
+        )
         self._calendar = calendar
         self._attr_name = (calendar.name or "Unknown").capitalize()
         self._attr_unique_id = f"{config_entry_id}-{calendar.id}"
+        # Downloaded object and item of every todo by href, from the last update
+        self._items: dict[str, tuple[CalendarObject, TodoItem | None]] = {}
+        # href of every todo by UID, from the last update
+        self._hrefs: dict[str, str] = {}
+        # Whether the items are from an earlier update as the last one failed
+        self._stale = False
+        self._snapshots = snapshots
+        self._discovery = discovery
+        # Held by updates and writes, which change the todos
+        self._lock = asyncio.Lock()
+
+    def restore(self) -> bool:
+        """Restore the todos saved before the last restart.
+
+        Returns whether a snapshot was restored, the items are revalidated
+        by the update following the addition of the entity.
+        """
+        if self._snapshots is None or (
+            snapshot := self._snapshots.get(self._snapshot_key)
+        ) is None:
+            return False
+        for href, etag, data in snapshot:
+            todo = CalendarObject(href, etag, data)
+            self._items[href] = (todo, _todo_item(todo))
+        self._update_todo_items()
+        return True
+
+    @property
+    def _snapshot_key(self) -> str:
+        """Return the key of the snapshot of the list."""
+        return f"todo.{self._calendar.id}"
+
+    @callback
+    def async_remove_snapshot(self) -> None:
+        """Remove the snapshot of a list deleted from the server."""
+        if self._snapshots is not None:
+            self._snapshots.async_remove(self._snapshot_key)
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Save the todos to restore them after a restart."""
+        if self._snapshots is not None:
+            self._snapshots.async_set(
+                self._snapshot_key,
+                [
+                    [href, todo.etag, todo.data]
+                    for href, (todo, _) in self._items.items()
+                ],
+            )
+
+    async def async_added_to_hass(self) -> None:
+        """Start polling the To-do list."""
+        await super().async_added_to_hass()
+        timers = async_get_timer_wheel(self.hass)
+        self.async_on_remove(partial(timers.async_remove, self))
+        self._async_schedule_poll()
+        self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        """Schedule the next update, spread from those of other lists."""
+        async_get_timer_wheel(self.hass).async_schedule(
+            self,
+            dt_util.utcnow().timestamp() + jittered(SCAN_INTERVAL).total_seconds(),
+            self._async_poll,
+        )
+
+    @callback
+    def _async_poll(self) -> None:
+        """Update the To-do list and schedule the next update."""
+        self._async_schedule_poll()
+        self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
 
     async def async_update(self) -> None:
-        """Update To-do list entity state."""
-        results = await self.hass.async_add_executor_job(
-            partial(
-                self._calendar.search,
-                todo=True,
-                include_completed=True,
+        """Update To-do list entity state.
+
+        Only the hrefs and ETags of the todos are listed, the objects that
+        are new or changed since the last update are downloaded with a
+        single calendar-multiget and the other items are reused. Todos
+        completed before the configured window are not retrieved. When the
+        server cannot be reached the last items are kept, marked stale.
+        Updates and writes run one at a time, so that a listing made before
+        a write cannot replace the item it saved.
+        """
+        async with self._lock:
+            await self._async_refresh()
+
+    async def _async_refresh(self) -> None:
+        """Refresh the todos, holding the lock."""
+        try:
+            etags = await async_todo_etags(
+                self._transport,
+                self._calendar,
+                (
+                    dt_util.utcnow() - self._completed_window
+                    if self._completed_window is not None
+                    else None
+                ),
             )
+            items = {
+                href: cached
+                for href, etag in etags.items()
+                if etag is not None
+                and (cached := self._items.get(href)) is not None
+                and cached[0].etag == etag
+            }
+            changed = [href for href in etags if href not in items]
+            for resource in await async_multiget(
+                self._transport, self._calendar, changed
+            ):
+                items[resource.href] = (resource, _todo_item(resource))
+        except CalDavError as err:
+            if isinstance(err, CalDavNotFoundError) and self._discovery is not None:
+                # The list was probably deleted, its entity is removed once
+                # the account is rediscovered without it
+                self.hass.async_create_task(self._discovery.async_rediscover())
+            if self._attr_todo_items is None:
+                raise
+            # Keep the entity available with the items of the last update
+            if not self._stale:
+                _LOGGER.warning(
+                    "Serving cached To-do items of %s: %s", self._calendar.name, err
+                )
+            self._stale = True
+            self._attr_extra_state_attributes = {"stale": True}
+            return
+        if self._stale:
+            _LOGGER.info("To-do items of %s are up to date again", self._calendar.name)
+            self._stale = False
+            self._attr_extra_state_attributes = {}
+        _LOGGER.debug(
+            "Fetched %d of %d todos of %s",
+            len(changed),
+            len(etags),
+            self._calendar.name,
         )
+        listed = self._items.keys() != etags.keys()
+        # Keep the order of the server listing
+        self._items = {href: items[href] for href in etags if href in items}
+        self._update_todo_items()
+        if changed or listed:
+            self._async_save_snapshot()
+
+    def _update_todo_items(self) -> None:
+        """Rebuild the items and the UID index from the cached todos."""
         self._attr_todo_items = [
-            todo_item
-            for resource in results
-            if (todo_item := _todo_item(resource)) is not None
+            todo_item for _, todo_item in self._items.values() if todo_item is not None
         ]
+        self._hrefs = {
+            cast(str, todo_item.uid): href
+            for href, (_, todo_item) in self._items.items()
+            if todo_item is not None
+        }
+
+    def _cache_saved(self, href: str, data: str, response: HttpResponse) -> bool:
+        """Cache a todo saved to the server, returning if it could be.
+
+        The server returns a strong ETag only when it stored the data as
+        sent. Without one the stored todo is unknown.
+        """
+        etag = response.headers.get("ETag")
+        if etag is None or etag.startswith("W/"):
+            return False
+        if (location := response.headers.get("Location")) is not None:
+            self._items.pop(href, None)
+            href = urljoin(href, location)
+        todo = CalendarObject(href, etag, data)
+        self._items[href] = (todo, _todo_item(todo))
+        return True
+
+    @callback
+    def _async_reconcile(self, cached: bool) -> None:
+        """Write the state after changes, refreshing if some are unknown."""
+        if not cached:
+            # refreshing async otherwise it would take too much time
+            self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
+            return
+        self._update_todo_items()
+        self._async_save_snapshot()
+        self.async_write_ha_state()
 
     async def async_create_todo_item(self, item: TodoItem) -> None:
         """Add an item to the To-do list."""
-        item_data: dict[str, Any] = {}
+        _, href, data = self._new_todo(item)
+        async with self._lock:
+            try:
+                response = await self._transport.put(href, data, create=True)
+            except CalDavError as err:
+                raise HomeAssistantError(f"CalDAV save error: {err}") from err
+            self._async_reconcile(self._cache_saved(href, data, response))
+
+    async def async_add_todo_items(
+        self, items: list[dict[str, Any]]
+    ) -> ServiceResponse:
+        """Add several items to the To-do list, reporting the result of each.
+
+        The items are written concurrently up to the configured limit and
+        the state is written, or the list refreshed, once at the end.
+        """
+        todos = [
+            self._new_todo(
+                TodoItem(
+                    summary=item[ATTR_ITEM],
+                    status=TodoItemStatus.NEEDS_ACTION,
+                    due=item.get(ATTR_DUE_DATE, item.get(ATTR_DUE_DATETIME)),
+                    description=item.get(ATTR_DESCRIPTION),
+                )
+            )
+            for item in items
+        ]
+        semaphore = asyncio.Semaphore(self._write_concurrency)
+
+        async def _async_put(href: str, data: str) -> HttpResponse:
+            async with semaphore:
+                return await self._transport.put(href, data, create=True)
+
+        async with self._lock:
+            responses = await asyncio.gather(
+                *(_async_put(href, data) for _, href, data in todos),
+                return_exceptions=True,
+            )
+            results: list[dict[str, Any]] = []
+            cached = True
+            for item, (uid, href, data), response in zip(
+                items, todos, responses, strict=True
+            ):
+                result = {ATTR_ITEM: item[ATTR_ITEM], ATTR_UID: uid, ATTR_ERROR: None}
+                if isinstance(response, CalDavError):
+                    result[ATTR_UID] = None
+                    result[ATTR_ERROR] = str(response)
+                elif isinstance(response, BaseException):
+                    raise response
+                else:
+                    cached = self._cache_saved(href, data, response) and cached
+                results.append(result)
+            self._async_reconcile(cached)
+        return {ATTR_ITEMS: results}
+
+    def _new_todo(self, item: TodoItem) -> tuple[str, str, str]:
+        """Return the UID, href and data of a new todo for an item."""
+        uid = str(uuid.uuid4())
+        vtodo = icalendar.Todo()
+        vtodo.add("UID", uid)
+        vtodo.add("DTSTAMP", dt_util.utcnow())
         if summary := item.summary:
-            item_data["summary"] = summary
+            vtodo.add("SUMMARY", summary)
         if status := item.status:
-            item_data["status"] = TODO_STATUS_MAP_INV.get(status, "NEEDS-ACTION")
+            vtodo.add("STATUS", TODO_STATUS_MAP_INV.get(status, "NEEDS-ACTION"))
+            if status == TodoItemStatus.COMPLETED:
+                vtodo.add("COMPLETED", dt_util.utcnow())
         if due := item.due:
-            item_data["due"] = due
+            vtodo.add("DUE", due)
         if description := item.description:
-            item_data["description"] = description
-        try:
-            await self.hass.async_add_executor_job(
-                partial(self._calendar.save_todo, **item_data),
-            )
-            # refreshing async otherwise it would take too much time
-            self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
-        except (requests.ConnectionError, DAVError) as err:
-            raise HomeAssistantError(f"CalDAV save error: {err}") from err
+            vtodo.add("DESCRIPTION", description)
+        vcalendar = icalendar.Calendar()
+        vcalendar.add("PRODID", "-//Home Assistant//CalDAV Custom//EN")
+        vcalendar.add("VERSION", "2.0")
+        vcalendar.add_component(vtodo)
+        return (
+            uid,
+            f"{self._calendar.url.rstrip('/')}/{uid}.ics",
+            vcalendar.to_ical().decode(),
+        )
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
-        """Update a To-do item."""
+        """Update a To-do item.
+
+        The todo downloaded by the last update is saved directly, on the
+        condition that it is unchanged on the server. It is only looked up
+        again when it is unknown, was modified by another client or was
+        moved.
+        """
         uid: str = cast(str, item.uid)
-        try:
-            todo = await self.hass.async_add_executor_job(
-                self._calendar.todo_by_uid, uid
-            )
-        except NotFoundError as err:
-            raise HomeAssistantError(f"Could not find To-do item {uid}") from err
-        except (requests.ConnectionError, DAVError) as err:
-            raise HomeAssistantError(f"CalDAV lookup error: {err}") from err
-        vtodo = todo.icalendar_component  # type: ignore[attr-defined]
+        async with self._lock:
+            if (href := self._hrefs.get(uid)) is not None:
+                try:
+                    await self._async_save_todo(self._items[href][0], item)
+                except (CalDavPreconditionFailedError, CalDavNotFoundError) as err:
+                    _LOGGER.debug("To-do item %s changed on the server: %s", uid, err)
+                except CalDavError as err:
+                    raise HomeAssistantError(f"CalDAV save error: {err}") from err
+                else:
+                    return
+            try:
+                todo = await async_todo_by_uid(self._transport, self._calendar, uid)
+            except CalDavNotFoundError as err:
+                raise HomeAssistantError(f"Could not find To-do item {uid}") from err
+            except CalDavError as err:
+                raise HomeAssistantError(f"CalDAV lookup error: {err}") from err
+            try:
+                await self._async_save_todo(todo, item)
+            except CalDavError as err:
+                raise HomeAssistantError(f"CalDAV save error: {err}") from err
+
+    async def _async_save_todo(self, todo: CalendarObject, item: TodoItem) -> None:
+        """Save the changes of an item to its todo, if the ETag still matches."""
+        vcalendar = icalendar.Calendar.from_ical(todo.data)
+        vtodo = next(iter(vcalendar.walk("VTODO")))
         vtodo["SUMMARY"] = item.summary or ""
         if status := item.status:
             vtodo["STATUS"] = TODO_STATUS_MAP_INV.get(status, "NEEDS-ACTION")
+            # The completion time ages completed todos out of the retrieved ones
+            if status != TodoItemStatus.COMPLETED:
+                vtodo.pop("COMPLETED", None)
+            elif "COMPLETED" not in vtodo:
+                vtodo.add("COMPLETED", dt_util.utcnow())
+        # DUE and DURATION are mutually exclusive
+        vtodo.pop("DUE", None)
         if due := item.due:
-            todo.set_due(due)  # type: ignore[attr-defined]
-        else:
-            vtodo.pop("DUE", None)
+            vtodo.pop("DURATION", None)
+            vtodo.add("DUE", due)
         if description := item.description:
             vtodo["DESCRIPTION"] = description
         else:
             vtodo.pop("DESCRIPTION", None)
-        try:
-            await self.hass.async_add_executor_job(
-                partial(
-                    todo.save,
-                    no_create=True,
-                    obj_type="todo",
-                ),
-            )
-            # refreshing async otherwise it would take too much time
-            self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
-        except (requests.ConnectionError, DAVError) as err:
-            raise HomeAssistantError(f"CalDAV save error: {err}") from err
+        data = vcalendar.to_ical().decode()
+        response = await self._transport.put(todo.href, data, etag=todo.etag)
+        self._async_reconcile(self._cache_saved(todo.href, data, response))
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
-        """Delete To-do items."""
-        tasks = (
-            self.hass.async_add_executor_job(self._calendar.todo_by_uid, uid)
-            for uid in uids
-        )
+        """Delete To-do items.
 
-        try:
-            items = await asyncio.gather(*tasks)
-        except NotFoundError as err:
-            raise HomeAssistantError("Could not find To-do item") from err
-        except (requests.ConnectionError, DAVError) as err:
-            raise HomeAssistantError(f"CalDAV lookup error: {err}") from err
-
-        # Run serially as some CalDAV servers do not support concurrent modifications
-        for item in items:
+        The deletes are conditional on the ETags of the last update. A todo
+        changed since is looked up again and deleted once more, one that is
+        already gone counts as deleted.
+        """
+        # Some CalDAV servers do not support concurrent modifications, the
+        # deletes run serially unless the server is configured to allow it
+        semaphore = asyncio.Semaphore(self._write_concurrency)
+
+        async def _async_delete(uid: str, href: str, etag: str | None) -> str:
+            """Delete a todo, looking it up again once if it changed."""
+            async with semaphore:
+                try:
+                    try:
+                        await self._transport.delete(href, etag)
+                    except CalDavPreconditionFailedError as err:
+                        _LOGGER.debug(
+                            "To-do item %s changed on the server: %s", uid, err
+                        )
+                        todo = await async_todo_by_uid(
+                            self._transport, self._calendar, uid
+                        )
+                        href = todo.href
+                        await self._transport.delete(href, todo.etag)
+                except CalDavNotFoundError:
+                    _LOGGER.debug("To-do item %s was already deleted", uid)
+            return href
+
+        async with self._lock:
             try:
-                await self.hass.async_add_executor_job(item.delete)
-            except (requests.ConnectionError, DAVError) as err:
+                items = await self._async_resolve_uids(uids)
+            except CalDavError as err:
+                raise HomeAssistantError(f"CalDAV lookup error: {err}") from err
+            try:
+                deleted = await asyncio.gather(
+                    *(
+                        _async_delete(uid, href, etag)
+                        for uid, (href, etag) in zip(uids, items, strict=True)
+                    )
+                )
+            except CalDavError as err:
+                # Some of the items may have been deleted, refreshing async
+                # otherwise it would take too much time
+                self.hass.async_create_task(
+                    self.async_update_ha_state(force_refresh=True)
+                )
                 raise HomeAssistantError(f"CalDAV delete error: {err}") from err
-        # refreshing async otherwise it would take too much time
-        self.hass.async_create_task(self.async_update_ha_state(force_refresh=True))
+            for (href, _), moved in zip(items, deleted, strict=True):
+                self._items.pop(href, None)
+                self._items.pop(moved, None)
+            self._async_reconcile(True)
+
+    async def _async_resolve_uids(
+        self, uids: list[str]
+    ) -> list[tuple[str, str | None]]:
+        """Return the href and ETag of the todos with the UIDs.
+
+        UIDs are looked up in the todos of the last update, which is only
+        repeated, listing the ETags and fetching the changed todos with a
+        single REPORT each, when some of them are unknown.
+        """
+        if any(uid not in self._hrefs for uid in uids):
+            await self._async_refresh()
+        if missing := [uid for uid in uids if uid not in self._hrefs]:
+            raise HomeAssistantError(f"Could not find To-do item {missing[0]}")
+        hrefs = [self._hrefs[uid] for uid in uids]
+        return [(href, self._items[href][0].etag) for href in hrefs]
@@ -0,0 +1,389 @@
+"""Asyncio HTTP transport for CalDAV servers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import hashlib
+import logging
+import secrets
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+from urllib.request import parse_http_list, parse_keqv_list
+import xml.etree.ElementTree as ET
+
+import aiohttp
+from multidict import CIMultiDict
+
+if TYPE_CHECKING:
+    from .scheduler import RequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+DAV_NS = "DAV:"
+CALDAV_NS = "urn:ietf:params:xml:ns:caldav"
+CALENDARSERVER_NS = "http://calendarserver.org/ns/"
+
+DEFAULT_TIMEOUT = 30
+# hashlib names of the Digest algorithms, the -sess variants use the same
+DIGEST_ALGORITHMS = {
+    "MD5": "md5",
+    "SHA-256": "sha256",
+    "SHA-512-256": "sha512_256",
+}
+# Seconds allowed for opening a new connection within the total timeout
+CONNECT_TIMEOUT = 10
+
+
+def dav_tag(name: str) -> str:
+    """Return the qualified name of a DAV: element."""
+    return f"{{{DAV_NS}}}{name}"
+
+
+def caldav_tag(name: str) -> str:
+    """Return the qualified name of a CalDAV element."""
+    return f"{{{CALDAV_NS}}}{name}"
+
+
+class CalDavError(Exception):
+    """Error returned by the CalDAV server or raised while talking to it."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error with the HTTP status, if any."""
+        super().__init__(message)
+        self.status = status
+
+
+class CalDavConnectionError(CalDavError):
+    """The CalDAV server could not be reached."""
+
+
+class CalDavAuthError(CalDavError):
+    """The CalDAV server rejected the credentials."""
+
+
+class CalDavNotFoundError(CalDavError):
+    """The requested resource does not exist."""
+
+
+class CalDavPreconditionFailedError(CalDavError):
+    """A conditional request (If-Match / If-None-Match) failed."""
+
+
+class CalDavThrottledError(CalDavConnectionError):
+    """The CalDAV server asked to retry the requests later."""
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the error with the seconds to wait, if the server said."""
+        super().__init__(message, status)
+        self.retry_after = retry_after
+
+
+class CalDavCircuitOpenError(CalDavConnectionError):
+    """Requests to the CalDAV server are suspended after repeated failures."""
+
+
+@dataclass(slots=True)
+class DavResponse:
+    """A single response element of a multistatus body."""
+
+    href: str
+    status: int
+    props: dict[str, ET.Element] = field(default_factory=dict)
+
+    def text(self, tag: str) -> str | None:
+        """Return the text value of a property."""
+        if (prop := self.props.get(tag)) is None:
+            return None
+        return prop.text
+
+
+@dataclass(slots=True)
+class Multistatus:
+    """A parsed 207 multistatus body."""
+
+    responses: list[DavResponse]
+    sync_token: str | None = None
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    """Status, headers and body of a completed request."""
+
+    status: int
+    headers: CIMultiDict[str]
+    body: bytes
+
+
+class CalDavTransport:
+    """Non-blocking client for the WebDAV methods used by CalDAV.
+
+    Requests go through an aiohttp session so no executor thread is held
+    while waiting on the server. Basic authentication is sent preemptively,
+    servers answering with a Digest challenge get a digest response
+    instead.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        username: str | None = None,
+        password: str | None = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        scheduler: RequestScheduler | None = None,
+    ) -> None:
+        """Initialize the transport.
+
+        Requests are queued through the scheduler of the server, when given.
+        """
+        self._session = session
+        self._scheduler = scheduler
+        self.url = url
+        self.username = username
+        self._password = password or ""
+        self._timeout = aiohttp.ClientTimeout(
+            total=timeout, connect=min(timeout, CONNECT_TIMEOUT)
+        )
+        self._digest: dict[str, str] | None = None
+        self._nonce_count = 0
+
+    def join(self, href: str) -> str:
+        """Return the absolute URL of an href returned by the server."""
+        return urljoin(self.url, href)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: str | bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> HttpResponse:
+        """Send a request and return the response, raising on error statuses."""
+        if self._scheduler is None:
+            return await self._async_send(method, url, body, headers)
+        async with self._scheduler.slot():
+            return await self._async_send(method, url, body, headers)
+
+    async def _async_send(
+        self,
+        method: str,
+        url: str,
+        body: str | bytes | None,
+        headers: dict[str, str] | None,
+    ) -> HttpResponse:
+        """Send a request, answering a Digest challenge if needed."""
+        headers = dict(headers or {})
+        for attempt in range(2):
+            if (authorization := self._authorization(method, url)) is not None:
+                headers["Authorization"] = authorization
+            try:
+                async with self._session.request(
+                    method,
+                    url,
+                    data=body,
+                    headers=headers,
+                    timeout=self._timeout,
+                ) as resp:
+                    response = HttpResponse(
+                        resp.status, resp.headers.copy(), await resp.read()
+                    )
+            except (aiohttp.ClientError, TimeoutError) as err:
+                raise CalDavConnectionError(
+                    f"{method} {url} failed: {err}"
+                ) from err
+            if (
+                response.status == 401
+                and attempt == 0
+                and self.username is not None
+                and self._set_digest_challenge(
+                    response.headers.get("WWW-Authenticate", "")
+                )
+            ):
+                continue
+            break
+        _raise_for_status(method, url, response)
+        return response
+
+    async def propfind(self, url: str, body: str, depth: int = 0) -> Multistatus:
+        """Send a PROPFIND request and parse the multistatus response."""
+        response = await self.request(
+            "PROPFIND",
+            url,
+            body,
+            {"Depth": str(depth), "Content-Type": "application/xml; charset=utf-8"},
+        )
+        return self._parse_multistatus(url, response.body)
+
+    async def report(self, url: str, body: str, depth: int = 1) -> Multistatus:
+        """Send a REPORT request and parse the multistatus response."""
+        response = await self.request(
+            "REPORT",
+            url,
+            body,
+            {"Depth": str(depth), "Content-Type": "application/xml; charset=utf-8"},
+        )
+        return self._parse_multistatus(url, response.body)
+
+    async def put(
+        self,
+        url: str,
+        data: str,
+        etag: str | None = None,
+        create: bool = False,
+    ) -> HttpResponse:
+        """Store a calendar object, conditional on its ETag when one is given."""
+        headers = {"Content-Type": "text/calendar; charset=utf-8"}
+        if etag is not None:
+            headers["If-Match"] = etag
+        elif create:
+            headers["If-None-Match"] = "*"
+        return await self.request("PUT", url, data.encode(), headers)
+
+    async def delete(self, url: str, etag: str | None = None) -> None:
+        """Delete a calendar object, conditional on its ETag when one is given."""
+        headers = {"If-Match": etag} if etag is not None else None
+        await self.request("DELETE", url, headers=headers)
+
+    def _parse_multistatus(self, url: str, body: bytes) -> Multistatus:
+        """Parse a multistatus body, resolving hrefs against the request URL."""
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError as err:
+            raise CalDavError(f"Invalid multistatus response: {err}") from err
+        responses = []
+        for element in root.iterfind(dav_tag("response")):
+            href = element.findtext(dav_tag("href"), "").strip()
+            response = DavResponse(
+                urljoin(url, href), _status_code(element.findtext(dav_tag("status")))
+            )
+            for propstat in element.iterfind(dav_tag("propstat")):
+                # Properties unknown to the server come back with a 404 status
+                if _status_code(propstat.findtext(dav_tag("status"))) >= 300:
+                    continue
+                for prop in propstat.iterfind(dav_tag("prop")):
+                    for value in prop:
+                        response.props[value.tag] = value
+            responses.append(response)
+        return Multistatus(responses, root.findtext(dav_tag("sync-token")))
+
+    def _authorization(self, method: str, url: str) -> str | None:
+        """Return the Authorization header for a request."""
+        if self.username is None:
+            return None
+        if self._digest is None:
+            return aiohttp.BasicAuth(self.username, self._password).encode()
+
+        challenge = self._digest
+        algorithm = challenge.get("algorithm", "MD5")
+        hash_name = DIGEST_ALGORITHMS[algorithm.upper().removesuffix("-SESS")]
+
+        def _hash(value: str) -> str:
+            return hashlib.new(hash_name, value.encode()).hexdigest()
+
+        split = urlsplit(url)
+        uri = split.path + (f"?{split.query}" if split.query else "")
+        self._nonce_count += 1
+        nonce_count = f"{self._nonce_count:08x}"
+        cnonce = secrets.token_hex(8)
+        ha1 = _hash(f"{self.username}:{challenge['realm']}:{self._password}")
+        if algorithm.upper().endswith("-SESS"):
+            ha1 = _hash(f"{ha1}:{challenge['nonce']}:{cnonce}")
+        ha2 = _hash(f"{method}:{uri}")
+        # The qop options are separated by commas with optional spaces
+        qops = [q.strip() for q in challenge.get("qop", "").split(",")]
+        qop = "auth" if "auth" in qops else None
+        if qop:
+            digest = _hash(
+                f"{ha1}:{challenge['nonce']}:{nonce_count}:{cnonce}:{qop}:{ha2}"
+            )
+        else:
+            digest = _hash(f"{ha1}:{challenge['nonce']}:{ha2}")
+        fields = [
+            f'username="{self.username}"',
+            f'realm="{challenge["realm"]}"',
+            f'nonce="{challenge["nonce"]}"',
+            f'uri="{uri}"',
+            f'response="{digest}"',
+            f"algorithm={algorithm}",
+        ]
+        if "opaque" in challenge:
+            fields.append(f'opaque="{challenge["opaque"]}"')
+        if qop:
+            fields.extend((f"qop={qop}", f"nc={nonce_count}", f'cnonce="{cnonce}"'))
+        return "Digest " + ", ".join(fields)
+
+    def _set_digest_challenge(self, header: str) -> bool:
+        """Remember a Digest challenge, return if the request should be retried.
+
+        Challenges with an algorithm that cannot be computed are not
+        answered, the request then fails with a CalDavAuthError.
+        """
+        scheme, _, params = header.partition(" ")
+        if scheme.lower() != "digest":
+            return False
+        challenge = parse_keqv_list(parse_http_list(params))
+        if "realm" not in challenge or "nonce" not in challenge:
+            return False
+        algorithm = challenge.get("algorithm", "MD5").upper().removesuffix("-SESS")
+        try:
+            hashlib.new(DIGEST_ALGORITHMS[algorithm])
+        except (KeyError, ValueError):
+            # Unknown, or missing from the OpenSSL build of Python
+            _LOGGER.warning("Unsupported Digest algorithm %s", algorithm)
+            return False
+        self._digest = challenge
+        self._nonce_count = 0
+        return True
+
+
+def _status_code(status: str | None) -> int:
+    """Return the code of an HTTP status line such as 'HTTP/1.1 200 OK'."""
+    if not status:
+        return 200
+    try:
+        return int(status.split()[1])
+    except (IndexError, ValueError):
+        return 200
+
+
+def _raise_for_status(method: str, url: str, response: HttpResponse) -> None:
+    """Raise the CalDavError matching an error status."""
+    if response.status < 400:
+        return
+    message = f"{method} {url} returned {response.status}"
+    if response.status == 401:
+        raise CalDavAuthError(message, response.status)
+    if response.status == 404:
+        raise CalDavNotFoundError(message, response.status)
+    if response.status == 412:
+        raise CalDavPreconditionFailedError(message, response.status)
+    if response.status in (429, 503):
+        raise CalDavThrottledError(
+            message,
+            response.status,
+            _retry_after(response.headers.get("Retry-After")),
+        )
+    _LOGGER.debug("%s: %s", message, response.body[:500])
+    raise CalDavError(message, response.status)
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait of a Retry-After header, if valid."""
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())